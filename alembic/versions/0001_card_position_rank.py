@@ -0,0 +1,33 @@
+import sqlalchemy as sa
+from alembic import op
+from utils.ranking import spaced_ranks
+revision = "0001_card_position_rank"
+down_revision = None
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("cards", sa.Column("rank", sa.String(255, collation="C"), nullable=True))
+    conn = op.get_bind()
+    list_ids = conn.execute(sa.text("SELECT DISTINCT list_id FROM cards")).scalars().all()
+    for list_id in list_ids:
+        card_ids = conn.execute(
+            sa.text("SELECT id FROM cards WHERE list_id = :list_id ORDER BY position, id"),
+            {"list_id": list_id}
+        ).scalars().all()
+        conn.execute(
+            sa.text("UPDATE cards SET rank = :rank WHERE id = :id"),
+            [{"id": card_id, "rank": rank} for card_id, rank in zip(card_ids, spaced_ranks(len(card_ids)))]
+        )
+    op.drop_column("cards", "position")
+    op.alter_column("cards", "rank", new_column_name="position", nullable=False)
+    op.create_index("idx_cards_list_id_position", "cards", ["list_id", "position"])
+def downgrade() -> None:
+    op.drop_index("idx_cards_list_id_position", table_name="cards")
+    op.add_column("cards", sa.Column("int_position", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE cards SET int_position = ranked.row_number - 1 FROM ("
+        "SELECT id, row_number() OVER (PARTITION BY list_id ORDER BY position, id) FROM cards"
+        ") AS ranked WHERE cards.id = ranked.id"
+    )
+    op.drop_column("cards", "position")
+    op.alter_column("cards", "int_position", new_column_name="position", nullable=False)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import sqlalchemy as sa
+from alembic import op
+from utils.ranking import spaced_ranks
+revision = "0002_list_position_rank"
+down_revision = "0001_card_position_rank"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("lists", sa.Column("rank", sa.String(255, collation="C"), nullable=True))
+    op.add_column("lists", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    conn = op.get_bind()
+    board_ids = conn.execute(sa.text("SELECT DISTINCT board_id FROM lists")).scalars().all()
+    for board_id in board_ids:
+        list_ids = conn.execute(
+            sa.text("SELECT id FROM lists WHERE board_id = :board_id ORDER BY position, id"),
+            {"board_id": board_id}
+        ).scalars().all()
+        conn.execute(
+            sa.text("UPDATE lists SET rank = :rank WHERE id = :id"),
+            [{"id": list_id, "rank": rank} for list_id, rank in zip(list_ids, spaced_ranks(len(list_ids)))]
+        )
+    op.drop_column("lists", "position")
+    op.alter_column("lists", "rank", new_column_name="position", nullable=False)
+    op.alter_column("lists", "version", server_default=None)
+    op.create_index("idx_lists_board_id_position", "lists", ["board_id", "position"])
+def downgrade() -> None:
+    op.drop_index("idx_lists_board_id_position", table_name="lists")
+    op.add_column("lists", sa.Column("int_position", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE lists SET int_position = ranked.row_number FROM ("
+        "SELECT id, row_number() OVER (PARTITION BY board_id ORDER BY position, id) FROM lists"
+        ") AS ranked WHERE lists.id = ranked.id"
+    )
+    op.drop_column("lists", "position")
+    op.drop_column("lists", "version")
+    op.alter_column("lists", "int_position", new_column_name="position", nullable=False)
\ No newline at end of file
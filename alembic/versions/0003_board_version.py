@@ -0,0 +1,10 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0003_board_version"
+down_revision = "0002_list_position_rank"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("boards", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+def downgrade() -> None:
+    op.drop_column("boards", "version")
\ No newline at end of file
@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0004_board_changes"
+down_revision = "0003_board_version"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_table(
+        "board_changes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("board_id", sa.Integer(), sa.ForeignKey("boards.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("idx_board_changes_board_id_version", "board_changes", ["board_id", "version"])
+def downgrade() -> None:
+    op.drop_index("idx_board_changes_board_id_version", table_name="board_changes")
+    op.drop_table("board_changes")
\ No newline at end of file
@@ -0,0 +1,10 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0005_board_members_version"
+down_revision = "0004_board_changes"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("boards", sa.Column("members_version", sa.Integer(), nullable=False, server_default="1"))
+def downgrade() -> None:
+    op.drop_column("boards", "members_version")
\ No newline at end of file
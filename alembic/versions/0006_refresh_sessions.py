@@ -0,0 +1,26 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0006_refresh_sessions"
+down_revision = "0005_board_members_version"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_table(
+        "refresh_sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("family_id", sa.String(32), nullable=False),
+        sa.Column("token_fingerprint", sa.String(64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("rotated_at", sa.DateTime(), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("idx_refresh_sessions_token_fingerprint", "refresh_sessions", ["token_fingerprint"], unique=True)
+    op.create_index("idx_refresh_sessions_family_id", "refresh_sessions", ["family_id"])
+    op.create_index("idx_refresh_sessions_user_id", "refresh_sessions", ["user_id"])
+def downgrade() -> None:
+    op.drop_index("idx_refresh_sessions_user_id", table_name="refresh_sessions")
+    op.drop_index("idx_refresh_sessions_family_id", table_name="refresh_sessions")
+    op.drop_index("idx_refresh_sessions_token_fingerprint", table_name="refresh_sessions")
+    op.drop_table("refresh_sessions")
\ No newline at end of file
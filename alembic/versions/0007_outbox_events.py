@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0007_outbox_events"
+down_revision = "0006_refresh_sessions"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("delivered_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("idx_outbox_events_undelivered", "outbox_events", ["id"], postgresql_where=sa.text("delivered_at IS NULL"))
+    op.create_index("idx_outbox_events_delivered_at", "outbox_events", ["delivered_at"])
+def downgrade() -> None:
+    op.drop_index("idx_outbox_events_delivered_at", table_name="outbox_events")
+    op.drop_index("idx_outbox_events_undelivered", table_name="outbox_events")
+    op.drop_table("outbox_events")
\ No newline at end of file
@@ -0,0 +1,11 @@
+from alembic import op
+revision = "0008_keyset_indexes"
+down_revision = "0007_outbox_events"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_index("idx_comments_card_id_created_at_id", "comments", ["card_id", "created_at", "id"])
+    op.create_index("idx_cards_created_at_id", "cards", ["created_at", "id"])
+def downgrade() -> None:
+    op.drop_index("idx_cards_created_at_id", table_name="cards")
+    op.drop_index("idx_comments_card_id_created_at_id", table_name="comments")
\ No newline at end of file
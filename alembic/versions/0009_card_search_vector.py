@@ -0,0 +1,60 @@
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+revision = "0009_card_search_vector"
+down_revision = "0008_keyset_indexes"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("cards", sa.Column("search_vector", TSVECTOR(), nullable=True))
+    op.execute("""
+        CREATE FUNCTION card_search_document(card_id integer, title text, description text) RETURNS tsvector AS $$
+            SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+                || setweight(to_tsvector('simple', coalesce(
+                    (SELECT string_agg(content, ' ') FROM comments WHERE comments.card_id = card_search_document.card_id),
+                    ''
+                )), 'C')
+        $$ LANGUAGE sql STABLE
+    """)
+    op.execute("""
+        CREATE FUNCTION cards_search_vector_trigger() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := card_search_document(NEW.id, NEW.title, NEW.description);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cards_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, description ON cards
+        FOR EACH ROW EXECUTE FUNCTION cards_search_vector_trigger()
+    """)
+    op.execute("""
+        CREATE FUNCTION comments_search_vector_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE cards SET search_vector = card_search_document(id, title, description) WHERE id = OLD.card_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.card_id IS DISTINCT FROM OLD.card_id) THEN
+                UPDATE cards SET search_vector = card_search_document(id, title, description) WHERE id = NEW.card_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_search_vector_update
+        AFTER INSERT OR UPDATE OF content, card_id OR DELETE ON comments
+        FOR EACH ROW EXECUTE FUNCTION comments_search_vector_trigger()
+    """)
+    op.execute("UPDATE cards SET search_vector = card_search_document(id, title, description)")
+    op.create_index("idx_cards_search_vector", "cards", ["search_vector"], postgresql_using="gin")
+def downgrade() -> None:
+    op.drop_index("idx_cards_search_vector", table_name="cards")
+    op.execute("DROP TRIGGER comments_search_vector_update ON comments")
+    op.execute("DROP FUNCTION comments_search_vector_trigger()")
+    op.execute("DROP TRIGGER cards_search_vector_update ON cards")
+    op.execute("DROP FUNCTION cards_search_vector_trigger()")
+    op.execute("DROP FUNCTION card_search_document(integer, text, text)")
+    op.drop_column("cards", "search_vector")
\ No newline at end of file
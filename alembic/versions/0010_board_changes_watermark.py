@@ -0,0 +1,12 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0010_board_changes_watermark"
+down_revision = "0009_card_search_vector"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("boards", sa.Column("changes_watermark", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index("idx_board_changes_created_at", "board_changes", ["created_at"])
+def downgrade() -> None:
+    op.drop_index("idx_board_changes_created_at", table_name="board_changes")
+    op.drop_column("boards", "changes_watermark")
\ No newline at end of file
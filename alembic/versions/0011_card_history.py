@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0011_card_history"
+down_revision = "0010_board_changes_watermark"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("card_history"):
+        op.create_table(
+            "card_history",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("card_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("action", sa.String(50), nullable=False),
+            sa.Column("details", sa.JSON(), nullable=False),
+            sa.Column("timestamp", sa.DateTime(), nullable=False),
+        )
+    op.create_index("idx_card_history_card_id_timestamp", "card_history", ["card_id", "timestamp"])
+def downgrade() -> None:
+    op.drop_index("idx_card_history_card_id_timestamp", table_name="card_history")
+    op.drop_table("card_history")
\ No newline at end of file
@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0012_board_activities"
+down_revision = "0011_card_history"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("board_activities"):
+        op.create_table(
+            "board_activities",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("board_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("action", sa.String(50), nullable=False),
+            sa.Column("details", sa.JSON(), nullable=False),
+            sa.Column("timestamp", sa.DateTime(), nullable=False),
+        )
+    op.create_index("idx_board_activities_board_id_timestamp", "board_activities", ["board_id", "timestamp"])
+def downgrade() -> None:
+    op.drop_index("idx_board_activities_board_id_timestamp", table_name="board_activities")
+    op.drop_table("board_activities")
\ No newline at end of file
@@ -0,0 +1,11 @@
+from alembic import op
+revision = "0013_cards_list_keyset_index"
+down_revision = "0012_board_activities"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_index("idx_cards_list_id_created_at_id", "cards", ["list_id", "created_at", "id"])
+    op.drop_index("idx_cards_created_at_id", table_name="cards")
+def downgrade() -> None:
+    op.create_index("idx_cards_created_at_id", "cards", ["created_at", "id"])
+    op.drop_index("idx_cards_list_id_created_at_id", table_name="cards")
\ No newline at end of file
@@ -0,0 +1,34 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0014_board_roles_and_invitations"
+down_revision = "0013_cards_list_keyset_index"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.add_column("boards", sa.Column("is_public", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column("board_members", sa.Column("role", sa.String(20), nullable=False, server_default="member"))
+    op.execute(
+        "INSERT INTO board_members (board_id, user_id, role) SELECT id, owner_id, 'admin' FROM boards "
+        "ON CONFLICT (board_id, user_id) DO UPDATE SET role = 'admin'"
+    )
+    op.create_table(
+        "board_invitations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("board_id", sa.Integer(), sa.ForeignKey("boards.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("token", sa.String(36), nullable=False, unique=True),
+        sa.Column("invited_by", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("used", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("used_at", sa.DateTime(), nullable=True),
+        sa.Column("declined", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("declined_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_board_invitations_board_id", "board_invitations", ["board_id"])
+def downgrade() -> None:
+    op.drop_index("ix_board_invitations_board_id", table_name="board_invitations")
+    op.drop_table("board_invitations")
+    op.drop_column("board_members", "role")
+    op.drop_column("boards", "is_public")
\ No newline at end of file
@@ -0,0 +1,18 @@
+import sqlalchemy as sa
+from alembic import op
+revision = "0015_card_assignees"
+down_revision = "0014_board_roles_and_invitations"
+branch_labels = None
+depends_on = None
+def upgrade() -> None:
+    op.create_table(
+        "card_assignees",
+        sa.Column("card_id", sa.Integer(), sa.ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.execute(
+        "INSERT INTO card_assignees (card_id, user_id) SELECT id, assigned_user_id FROM cards "
+        "WHERE assigned_user_id IS NOT NULL"
+    )
+def downgrade() -> None:
+    op.drop_table("card_assignees")
\ No newline at end of file
@@ -1,28 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import User
 from schemas import UserCreate, UserResponse, Token, TokenRefresh
 from database import get_db
-from auth.jwt_handler import create_access_token, create_refresh_token, verify_token
+from auth.jwt_handler import create_access_token, create_refresh_token, store_refresh_token, refresh_access_token
+from auth.password_hasher import password_hasher
 from repositories.user_repository import UserRepository
-from utils.validators import validate_email, validate_password
+from utils.validators import validate_email_format, validate_password
 from utils.exceptions import UserAlreadyExistsError, InvalidCredentialsError
 router = APIRouter(prefix="/auth", tags=["auth"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    if not validate_email(user_data.email):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+    if not validate_email_format(user_data.email):
         raise HTTPException(status_code=400, detail="Invalid email format")
     if not validate_password(user_data.password):
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
     user_repo = UserRepository(db)
-    if user_repo.get_by_email(user_data.email):
+    if await user_repo.get_by_email(user_data.email):
         raise UserAlreadyExistsError(detail="Email already registered")
-    if user_repo.get_by_username(user_data.username):
+    if await user_repo.get_by_username(user_data.username):
         raise UserAlreadyExistsError(detail="Username already taken")
-    user = user_repo.create(user_data)
+    hashed_password = await password_hasher.hash(user_data.password)
+    user = await user_repo.create_with_password(user_data, hashed_password)
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    await store_refresh_token(user.id, refresh_token, db)
     return UserResponse(
         id=user.id,
         email=user.email,
@@ -32,34 +35,19 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         token_type="bearer"
     )
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     user_repo = UserRepository(db)
-    user = user_repo.authenticate(form_data.username, form_data.password)
-    if not user:
+    user = await user_repo.get_by_username(form_data.username) or await user_repo.get_by_email(form_data.username)
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise InvalidCredentialsError(detail="Incorrect username or password")
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    await store_refresh_token(user.id, refresh_token, db)
     return Token(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer"
     )
 @router.post("/refresh", response_model=Token)
-async def refresh(token_data: TokenRefresh, db: Session = Depends(get_db)):
-    payload = verify_token(token_data.refresh_token, token_type="refresh")
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    access_token = create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
-    return Token(
-        access_token=access_token,
-        refresh_token=new_refresh_token,
-        token_type="bearer"
-    )
\ No newline at end of file
+async def refresh(token_data: TokenRefresh, db: AsyncSession = Depends(get_db)):
+    return Token(**await refresh_access_token(token_data.refresh_token, db))
\ No newline at end of file
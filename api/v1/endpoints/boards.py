@@ -1,97 +1,146 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Response, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from schemas import BoardCreate, BoardUpdate, BoardResponse, BoardMemberResponse, BoardMemberAdd
+from schemas import BoardCreate, BoardUpdate, BoardResponse, BoardMemberResponse, BoardMemberAdd, BoardChangesResponse
+from schemas.board import BoardImportSummary
 from services.board_service import BoardService
+from services.board_export import stream_board_export
+from services.board_import import import_board, load_dump
 from auth.dependencies import get_current_active_user
 from models import User
 from database import get_db
-from utils.exceptions import NotFoundException, PermissionDeniedException
+from utils.exceptions import NotFoundException, PermissionException
+from utils.etag import board_etag, etag_matches, not_modified, set_etag
 router = APIRouter(prefix="/boards", tags=["boards"])
 @router.post("/", response_model=BoardResponse, status_code=status.HTTP_201_CREATED)
 async def create_board(
     board_data: BoardCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        return service.create_board(board_data, current_user.id)
+        return await BoardService.create_board(db, board_data, current_user)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+@router.post("/import", response_model=BoardImportSummary, status_code=status.HTTP_201_CREATED)
+async def import_board_dump(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", pattern="^(ndjson|trello)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    dump = load_dump(await file.read(), format)
+    return await import_board(db, dump, current_user)
 @router.get("/", response_model=list[BoardResponse])
 async def get_user_boards(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
-    return service.get_user_boards(current_user.id)
+    return await BoardService.get_user_boards(db, current_user)
 @router.get("/{board_id}", response_model=BoardResponse)
 async def get_board(
-    board_id: str,
+    board_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        etag = board_etag(await BoardService.get_board_stamp(db, board_id, current_user), "board")
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        snapshot = await BoardService.get_board_snapshot(db, board_id, current_user)
+        response = Response(content=snapshot, media_type="application/json")
+        set_etag(response, etag)
+        return response
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+@router.get("/{board_id}/changes", response_model=BoardChangesResponse, response_model_exclude_defaults=True)
+async def get_board_changes(
+    board_id: int,
+    since: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        return service.get_board(board_id, current_user.id)
+        return await BoardService.get_changes_since(db, board_id, current_user, since)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+@router.get("/{board_id}/export")
+async def export_board(
+    board_id: int,
+    gzip: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        board = await BoardService.get_board(db, board_id, current_user)
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    filename = f"board-{board.id}.ndjson.gz" if gzip else f"board-{board.id}.ndjson"
+    return StreamingResponse(
+        stream_board_export(board.id, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 @router.put("/{board_id}", response_model=BoardResponse)
 async def update_board(
-    board_id: str,
+    board_id: int,
     board_data: BoardUpdate,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        return service.update_board(board_id, board_data, current_user.id)
+        return await BoardService.update_board(db, board_id, board_data, current_user, if_match)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 @router.delete("/{board_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_board(
-    board_id: str,
+    board_id: int,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        service.delete_board(board_id, current_user.id)
+        await BoardService.delete_board(db, board_id, current_user, if_match)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 @router.get("/{board_id}/members", response_model=list[BoardMemberResponse])
 async def get_board_members(
     board_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        return service.get_board_members(board_id, current_user.id)
+        return await BoardService.get_board_members(db, board_id, current_user)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 @router.post("/{board_id}/members", response_model=BoardMemberResponse, status_code=status.HTTP_201_CREATED)
 async def add_board_member(
     board_id: str,
     member_data: BoardMemberAdd,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     service = BoardService(db)
     try:
-        return service.add_board_member(board_id, member_data.user_id, current_user.id)
+        return await service.add_board_member(board_id, member_data.user_id, current_user.id)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -100,14 +149,13 @@ async def remove_board_member(
     board_id: str,
     user_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    service = BoardService(db)
     try:
-        service.remove_board_member(board_id, user_id, current_user.id)
+        await BoardService.remove_member(db, board_id, user_id, current_user)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except PermissionDeniedException as e:
+    except PermissionException as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
@@ -1,88 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select
 from datetime import datetime
-from database import get_db
+from typing import Optional
+from database import get_db, get_unit_of_work
 from auth.dependencies import get_current_user
-from models import User, Comment, Card
-from schemas import CommentCreate, CommentUpdate, CommentResponse
+from models import User, Comment, Card, List
+from schemas import CommentCreate, CommentUpdate, CommentResponse, Page
 from services.card_service import CardService
-from utils.exceptions import NotFoundException, ForbiddenException
+from services.notification_service import NotificationService
+from repositories.base import paginate
+from repositories.board_repository import BoardRepository
+from utils.exceptions import NotFoundError, PermissionError
 router = APIRouter()
-@router.get("/cards/{card_id}/comments", response_model=list[CommentResponse])
-def get_comments_by_card(
+async def _get_comment(comment_id: int, db: AsyncSession) -> Comment | None:
+    query = select(Comment).options(
+        joinedload(Comment.card).joinedload(Card.list).joinedload(List.board)
+    ).where(Comment.id == comment_id)
+    return (await db.execute(query)).scalar_one_or_none()
+@router.get("/cards/{card_id}/comments", response_model=Page[CommentResponse])
+async def get_comments_by_card(
     card_id: int,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    card_service = CardService(db)
+    card_service = CardService(db, NotificationService(db))
     try:
-        card = card_service.get_card(card_id)
-        board = card.list.board
-        if current_user not in board.members and board.owner_id != current_user.id:
-            raise ForbiddenException("You don't have access to this board")
-    except NotFoundException:
+        await card_service.get_card(card_id, current_user.id)
+    except NotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    except ForbiddenException as e:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
-    comments = db.query(Comment).filter(Comment.card_id == card_id).order_by(Comment.created_at.desc()).all()
-    return comments
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.detail)
+    comments, next_cursor = await paginate(
+        db,
+        select(Comment).where(Comment.card_id == card_id),
+        Comment.created_at,
+        Comment.id,
+        limit=limit,
+        cursor=cursor,
+        descending=True
+    )
+    return Page(items=comments, next_cursor=next_cursor)
 @router.post("/cards/{card_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
-def create_comment(
+async def create_comment(
     card_id: int,
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    card_service = CardService(db)
+    card_service = CardService(db, NotificationService(db))
     try:
-        card = card_service.get_card(card_id)
-        board = card.list.board
-        if current_user not in board.members and board.owner_id != current_user.id:
-            raise ForbiddenException("You don't have access to this board")
-    except NotFoundException:
+        card = await card_service.get_card(card_id, current_user.id)
+    except NotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    except ForbiddenException as e:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.detail)
     new_comment = Comment(
         content=comment_data.content,
         card_id=card_id,
-        author_id=current_user.id,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        user_id=current_user.id,
+        created_at=datetime.utcnow()
     )
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await BoardRepository(db).record_change(card.list.board_id, "card", card_id)
+    await get_unit_of_work(db).commit()
+    await db.refresh(new_comment)
     return new_comment
 @router.put("/comments/{comment_id}", response_model=CommentResponse)
-def update_comment(
+async def update_comment(
     comment_id: int,
     comment_data: CommentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await _get_comment(comment_id, db)
     if not comment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    if comment.author_id != current_user.id:
+    if comment.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only update your own comments")
     comment.content = comment_data.content
     comment.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(comment)
+    await BoardRepository(db).record_change(comment.card.list.board_id, "card", comment.card_id)
+    await get_unit_of_work(db).commit()
+    await db.refresh(comment)
     return comment
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_comment(
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await _get_comment(comment_id, db)
     if not comment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
     board = comment.card.list.board
-    if comment.author_id != current_user.id and board.owner_id != current_user.id:
+    if comment.user_id != current_user.id and board.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You don't have permission to delete this comment")
-    db.delete(comment)
-    db.commit()
+    await BoardRepository(db).record_change(board.id, "card", comment.card_id)
+    await db.delete(comment)
+    await get_unit_of_work(db).commit()
     return None
\ No newline at end of file
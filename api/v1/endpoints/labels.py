@@ -1,121 +1,150 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Any
-from models import Label, Board, Card, User, card_labels_association
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, select
+from typing import Any, Optional
+from models import Label, Board, Card, User
 from schemas import LabelCreate, LabelUpdate, LabelResponse
 from auth.dependencies import get_current_active_user
-from database import get_db
+from database import get_db, get_unit_of_work
+from repositories.board_repository import BoardRepository
+from services.board_service import BoardService
+from utils.etag import board_etag, etag_matches, not_modified, set_etag
+from utils.exceptions import NotFoundException, PermissionException
 router = APIRouter()
-def _check_board_access(board_id: int, user: User, db: Session) -> Board:
-    board = db.query(Board).filter(Board.id == board_id).first()
+async def _check_board_access(board_id: int, user: User, db: AsyncSession) -> Board:
+    board = await db.get(Board, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
-    if board.owner_id != user.id and user not in board.members:
+    if (await BoardService.get_board_acl(db, board)).role_of(user.id) is None:
         raise HTTPException(status_code=403, detail="Not authorized to access this board")
     return board
-def _get_label_with_access(label_id: int, user: User, db: Session) -> Label:
-    label = db.query(Label).filter(Label.id == label_id).first()
+async def _get_label_with_access(label_id: int, user: User, db: AsyncSession) -> Label:
+    label = await db.get(Label, label_id)
     if not label:
         raise HTTPException(status_code=404, detail="Label not found")
-    _check_board_access(label.board_id, user, db)
+    await _check_board_access(label.board_id, user, db)
     return label
-def _get_card_with_access(card_id: int, user: User, db: Session) -> Card:
-    card = db.query(Card).filter(Card.id == card_id).first()
+async def _get_card(card_id: int, db: AsyncSession) -> Card | None:
+    query = select(Card).options(joinedload(Card.list), selectinload(Card.labels)).where(Card.id == card_id)
+    return (await db.execute(query)).scalar_one_or_none()
+async def _get_card_with_access(card_id: int, user: User, db: AsyncSession) -> Card:
+    card = await _get_card(card_id, db)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
-    _check_board_access(card.list.board_id, user, db)
+    await _check_board_access(card.list.board_id, user, db)
     return card
 @router.post("/", response_model=LabelResponse, status_code=status.HTTP_201_CREATED)
-def create_label(
+async def create_label(
     label_data: LabelCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    _check_board_access(label_data.board_id, current_user, db)
+    await _check_board_access(label_data.board_id, current_user, db)
     db_label = Label(
         name=label_data.name,
         color=label_data.color,
         board_id=label_data.board_id
     )
     db.add(db_label)
-    db.commit()
-    db.refresh(db_label)
+    await db.flush()
+    await BoardRepository(db).record_change(label_data.board_id, "label", db_label.id)
+    await get_unit_of_work(db).commit()
+    await db.refresh(db_label)
     return db_label
 @router.get("/{label_id}", response_model=LabelResponse)
-def read_label(
+async def read_label(
     label_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    return _get_label_with_access(label_id, current_user, db)
+    return await _get_label_with_access(label_id, current_user, db)
 @router.put("/{label_id}", response_model=LabelResponse)
-def update_label(
+async def update_label(
     label_id: int,
     label_data: LabelUpdate,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    label = _get_label_with_access(label_id, current_user, db)
+    label = await _get_label_with_access(label_id, current_user, db)
+    await BoardService.check_precondition(db, label.board_id, if_match, "labels")
     update_data = label_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(label, field, value)
-    db.commit()
-    db.refresh(label)
+    await BoardRepository(db).record_change(label.board_id, "label", label.id)
+    await get_unit_of_work(db).commit()
+    await db.refresh(label)
     return label
 @router.delete("/{label_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_label(
+async def delete_label(
     label_id: int,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> None:
-    label = _get_label_with_access(label_id, current_user, db)
-    db.delete(label)
-    db.commit()
+    label = await _get_label_with_access(label_id, current_user, db)
+    await BoardService.check_precondition(db, label.board_id, if_match, "labels")
+    await BoardRepository(db).record_change(label.board_id, "label", label.id, "delete")
+    await db.delete(label)
+    await get_unit_of_work(db).commit()
     return None
 @router.get("/board/{board_id}", response_model=list[LabelResponse])
-def read_labels_by_board(
+async def read_labels_by_board(
     board_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    _check_board_access(board_id, current_user, db)
-    labels = db.query(Label).filter(Label.board_id == board_id).all()
+    try:
+        stamp = await BoardService.get_board_stamp(db, board_id, current_user)
+    except NotFoundException:
+        raise HTTPException(status_code=404, detail="Board not found")
+    except PermissionException:
+        raise HTTPException(status_code=403, detail="Not authorized to access this board")
+    etag = board_etag(stamp, "labels")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    labels = (await db.execute(select(Label).where(Label.board_id == board_id))).scalars().all()
     return labels
 @router.post("/{label_id}/cards/{card_id}", status_code=status.HTTP_200_OK)
-def assign_label_to_card(
+async def assign_label_to_card(
     label_id: int,
     card_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> dict[str, str]:
-    label = _get_label_with_access(label_id, current_user, db)
-    card = _get_card_with_access(card_id, current_user, db)
+    label = await _get_label_with_access(label_id, current_user, db)
+    card = await _get_card_with_access(card_id, current_user, db)
     if label.board_id != card.list.board_id:
         raise HTTPException(status_code=400, detail="Label and card must belong to the same board")
     if label in card.labels:
         raise HTTPException(status_code=400, detail="Label already assigned to this card")
     card.labels.append(label)
-    db.commit()
+    await BoardRepository(db).record_change(label.board_id, "card", card.id)
+    await get_unit_of_work(db).commit()
     return {"message": "Label assigned successfully"}
 @router.delete("/{label_id}/cards/{card_id}", status_code=status.HTTP_200_OK)
-def remove_label_from_card(
+async def remove_label_from_card(
     label_id: int,
     card_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> dict[str, str]:
-    label = db.query(Label).filter(Label.id == label_id).first()
+    label = await db.get(Label, label_id)
     if not label:
         raise HTTPException(status_code=404, detail="Label not found")
-    card = db.query(Card).filter(Card.id == card_id).first()
+    card = await _get_card(card_id, db)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
-    _check_board_access(label.board_id, current_user, db)
+    await _check_board_access(label.board_id, current_user, db)
     if label.board_id != card.list.board_id:
         raise HTTPException(status_code=400, detail="Label and card must belong to the same board")
     if label not in card.labels:
         raise HTTPException(status_code=400, detail="Label not assigned to this card")
     card.labels.remove(label)
-    db.commit()
+    await BoardRepository(db).record_change(label.board_id, "card", card.id)
+    await get_unit_of_work(db).commit()
     return {"message": "Label removed successfully"}
\ No newline at end of file
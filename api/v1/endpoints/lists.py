@@ -1,69 +1,108 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import func, select
 import logging
-from database import get_db
-from models import List, Board, User
-from schemas import ListSchema, ListCreate, ListUpdate, ListReorder
+from database import get_db, get_unit_of_work
+from models import List, Board, Card, User
+from schemas import ListResponse, ListCreate, ListUpdate, ListReorder
 from services.board_service import BoardService
+from services.rank_rebalancer import rank_rebalancer
+from repositories.board_repository import BoardRepository
 from auth.dependencies import get_current_user
-from utils.exceptions import NotFoundException, ForbiddenException
+from utils.exceptions import NotFoundException, PermissionException
+from utils.etag import board_etag, etag_matches, not_modified, set_etag
+from utils.ranking import rank_between, needs_rebalance
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/lists", tags=["lists"])
-@router.get("/board/{board_id}", response_model=list[ListSchema])
-def get_lists_by_board(
+async def _rank_at(db: AsyncSession, board_id: int, index: int, exclude_list_id: Optional[int] = None) -> str:
+    query = select(List.position).where(List.board_id == board_id)
+    if exclude_list_id is not None:
+        query = query.where(List.id != exclude_list_id)
+    neighbours = (await db.execute(
+        query.order_by(List.position, List.id).offset(max(index - 1, 0)).limit(2)
+    )).scalars().all()
+    if index <= 0:
+        return rank_between(None, neighbours[0] if neighbours else None)
+    if not neighbours:
+        last = (await db.execute(
+            query.order_by(List.position.desc(), List.id.desc()).limit(1)
+        )).scalar_one_or_none()
+        return rank_between(last, None)
+    before = neighbours[0]
+    after = neighbours[1] if len(neighbours) > 1 else None
+    if after is not None and after <= before:
+        rank_rebalancer.schedule_board(board_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="List ordering is being rebalanced, retry the reorder"
+        )
+    return rank_between(before, after)
+@router.get("/board/{board_id}", response_model=list[ListResponse])
+async def get_lists_by_board(
     board_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    board_service = BoardService(db)
-    if not board_service.user_has_access(board_id, current_user.id):
+    try:
+        stamp = await BoardService.get_board_stamp(db, board_id, current_user)
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionException:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
-    lists = db.query(List).filter(List.board_id == board_id).order_by(List.position).all()
+    etag = board_etag(stamp, "lists")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    lists = (await db.execute(select(List).where(List.board_id == board_id).order_by(List.position))).scalars().all()
     return lists
-@router.get("/{list_id}", response_model=ListSchema)
-def get_list(
+@router.get("/{list_id}", response_model=ListResponse)
+async def get_list(
     list_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    list_obj = db.query(List).filter(List.id == list_id).first()
+    list_obj = await db.get(List, list_id)
     if not list_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="List not found"
         )
     board_service = BoardService(db)
-    if not board_service.user_has_access(list_obj.board_id, current_user.id):
+    if not await board_service.user_has_access(list_obj.board_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
     return list_obj
-@router.post("/", response_model=ListSchema, status_code=status.HTTP_201_CREATED)
-def create_list(
+@router.post("/", response_model=ListResponse, status_code=status.HTTP_201_CREATED)
+async def create_list(
     list_data: ListCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     board_service = BoardService(db)
-    board = db.query(Board).filter(Board.id == list_data.board_id).first()
+    board = await db.get(Board, list_data.board_id)
     if not board:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Board not found"
         )
-    if not board_service.user_has_access(board.id, current_user.id):
+    if not await board_service.user_has_access(board.id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
-    max_position = db.query(func.max(List.position)).filter(List.board_id == list_data.board_id).scalar()
-    new_position = (max_position or 0) + 1
+    max_position = (await db.execute(select(func.max(List.position)).where(List.board_id == list_data.board_id))).scalar()
+    new_position = rank_between(max_position, None)
+    if needs_rebalance(new_position):
+        rank_rebalancer.schedule_board(list_data.board_id)
     new_list = List(
         title=list_data.title,
         board_id=list_data.board_id,
@@ -71,150 +110,154 @@ def create_list(
     )
     try:
         db.add(new_list)
-        db.commit()
-        db.refresh(new_list)
+        await db.flush()
+        await BoardRepository(db).record_change(list_data.board_id, "list", new_list.id)
+        await get_unit_of_work(db).commit()
+        await db.refresh(new_list)
         logger.info(f"List created: {new_list.id} by user {current_user.id}")
         return new_list
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating list: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create list"
         )
-@router.put("/{list_id}", response_model=ListSchema)
-def update_list(
+@router.put("/{list_id}", response_model=ListResponse)
+async def update_list(
     list_id: int,
     list_data: ListUpdate,
-    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    list_obj = db.query(List).filter(List.id == list_id).with_for_update().first()
+    list_obj = await db.get(List, list_id)
     if not list_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="List not found"
         )
     board_service = BoardService(db)
-    if not board_service.user_has_access(list_obj.board_id, current_user.id):
+    if not await board_service.user_has_access(list_obj.board_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
+    await BoardService.check_precondition(db, list_obj.board_id, if_match, "lists")
     update_data = list_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(list_obj, field, value)
     try:
-        db.commit()
-        db.refresh(list_obj)
+        await BoardRepository(db).record_change(list_obj.board_id, "list", list_id)
+        await get_unit_of_work(db).commit()
+        await db.refresh(list_obj)
         logger.info(f"List updated: {list_id} by user {current_user.id}")
         return list_obj
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="List was modified concurrently"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error updating list {list_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update list"
         )
 @router.delete("/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_list(
+async def delete_list(
     list_id: int,
-    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    list_obj = db.query(List).filter(List.id == list_id).with_for_update().first()
+    list_obj = await db.get(List, list_id)
     if not list_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="List not found"
         )
     board_service = BoardService(db)
-    if not board_service.user_has_access(list_obj.board_id, current_user.id):
+    if not await board_service.user_has_access(list_obj.board_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
+    await BoardService.check_precondition(db, list_obj.board_id, if_match, "lists")
     try:
-        board_id = list_obj.board_id
-        deleted_position = list_obj.position
-        db.delete(list_obj)
-        db.query(List).filter(
-            and_(
-                List.board_id == board_id,
-                List.position > deleted_position
-            )
-        ).update(
-            {"position": List.position - 1},
-            synchronize_session=False
-        )
-        db.commit()
+        board_repository = BoardRepository(db)
+        card_ids = (await db.execute(select(Card.id).where(Card.list_id == list_id))).scalars().all()
+        for card_id in card_ids:
+            await board_repository.record_change(list_obj.board_id, "card", card_id, "delete")
+        await board_repository.record_change(list_obj.board_id, "list", list_id, "delete")
+        await db.delete(list_obj)
+        await get_unit_of_work(db).commit()
         logger.info(f"List deleted: {list_id} by user {current_user.id}")
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="List was modified concurrently"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error deleting list {list_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete list"
         )
-@router.put("/{list_id}/reorder", response_model=ListSchema)
-def reorder_list(
+@router.put("/{list_id}/reorder", response_model=ListResponse)
+async def reorder_list(
     list_id: int,
     reorder_data: ListReorder,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    list_obj = db.query(List).filter(List.id == list_id).with_for_update().first()
+    list_obj = await db.get(List, list_id)
     if not list_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="List not found"
         )
     board_service = BoardService(db)
-    if not board_service.user_has_access(list_obj.board_id, current_user.id):
+    if not await board_service.user_has_access(list_obj.board_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this board"
         )
+    if reorder_data.version != list_obj.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="List was modified concurrently"
+        )
     new_position = reorder_data.new_position
-    list_count = db.query(func.count(List.id)).filter(List.board_id == list_obj.board_id).scalar()
+    list_count = (await db.execute(select(func.count(List.id)).where(List.board_id == list_obj.board_id))).scalar()
     if new_position < 1 or new_position > list_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid position"
         )
     old_position = list_obj.position
-    if old_position == new_position:
-        return list_obj
+    new_rank = await _rank_at(db, list_obj.board_id, new_position - 1, exclude_list_id=list_id)
     try:
-        if new_position < old_position:
-            db.query(List).filter(
-                and_(
-                    List.board_id == list_obj.board_id,
-                    List.position >= new_position,
-                    List.position < old_position
-                )
-            ).update(
-                {"position": List.position + 1},
-                synchronize_session=False
-            )
-        else:
-            db.query(List).filter(
-                and_(
-                    List.board_id == list_obj.board_id,
-                    List.position > old_position,
-                    List.position <= new_position
-                )
-            ).update(
-                {"position": List.position - 1},
-                synchronize_session=False
-            )
-        list_obj.position = new_position
-        db.commit()
-        db.refresh(list_obj)
-        logger.info(f"List reordered: {list_id} from {old_position} to {new_position} by user {current_user.id}")
+        list_obj.position = new_rank
+        await BoardRepository(db).record_change(list_obj.board_id, "list", list_id)
+        await get_unit_of_work(db).commit()
+        await db.refresh(list_obj)
+        if needs_rebalance(new_rank):
+            rank_rebalancer.schedule_board(list_obj.board_id)
+        logger.info(f"List reordered: {list_id} from {old_position} to {new_rank} by user {current_user.id}")
         return list_obj
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="List was modified concurrently"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error reordering list {list_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,19 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User
+from schemas import CardSearchHit, Page
+from services.search_service import SearchService
+from auth.dependencies import get_current_active_user
+from database import get_db
+router = APIRouter()
+@router.get("/", response_model=Page[CardSearchHit])
+async def search_cards(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    hits, next_cursor = await SearchService.search_cards(db, current_user.id, q, limit=limit, cursor=cursor)
+    return Page(items=hits, next_cursor=next_cursor)
\ No newline at end of file
@@ -1,32 +1,221 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from sqlalchemy import select
+import asyncio
 import json
+import logging
+from collections import OrderedDict, deque
+from typing import Optional
 from jose import JWTError
+from redis.asyncio import Redis
 from auth.jwt_handler import verify_token
-from database import get_db
+from config import settings
+from database import AsyncSessionLocal
 from models import User
 from services.board_service import BoardService
+from services.outbox_relay import board_sequence_key
+from utils.exceptions import NotFoundException, PermissionException
+from utils.circuit_breaker import CircuitOpenError
+from utils.event_coalescing import coalesce_events
+from utils.redis_client import redis_client, redis_breaker
+logger = logging.getLogger(__name__)
 router = APIRouter()
+NOTIFICATION_CHANNEL_PATTERN = "board:*:notifications"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_RESYNC = "resync"
+OVERFLOW_DISCONNECT = "disconnect"
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+def extract_seq(message: str) -> Optional[int]:
+    if not message.startswith('{"seq":'):
+        return None
+    end = message.find(",", 7)
+    try:
+        return int(message[7:end])
+    except ValueError:
+        return None
+class ReplayBuffer:
+    def __init__(self, max_events: int = 500, max_boards: int = 1000):
+        self.max_events = max_events
+        self.max_boards = max_boards
+        self._events: OrderedDict[int, deque[tuple[int, str]]] = OrderedDict()
+    def record(self, board_id: int, seq: int, message: str):
+        events = self._events.get(board_id)
+        if events is None:
+            events = self._events[board_id] = deque(maxlen=self.max_events)
+            while len(self._events) > self.max_boards:
+                self._events.popitem(last=False)
+        else:
+            self._events.move_to_end(board_id)
+        if events and seq <= events[-1][0]:
+            return
+        events.append((seq, message))
+    def since(self, board_id: int, last_seq: int, current_seq: int) -> Optional[list[str]]:
+        events = self._events.get(board_id) or deque()
+        latest = max(current_seq, events[-1][0] if events else 0)
+        if last_seq >= latest:
+            return []
+        if not events or events[0][0] > last_seq + 1:
+            return None
+        return [message for seq, message in events if seq > last_seq]
+replay_buffer = ReplayBuffer(
+    max_events=settings.WS_REPLAY_BUFFER_SIZE,
+    max_boards=settings.WS_REPLAY_MAX_BOARDS
+)
+class ClientConnection:
+    def __init__(self, websocket: WebSocket, max_queue_size: int, overflow_policy: str):
+        self.websocket = websocket
+        self.overflow_policy = overflow_policy
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self.writer_task: Optional[asyncio.Task] = None
+        self.closed = False
+    def start(self):
+        self.writer_task = asyncio.create_task(self._write_loop())
+    async def _write_loop(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                await self.websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.closed = True
+    def _clear_queue(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+    def enqueue(self, message: str) -> bool:
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self.overflow_policy == OVERFLOW_DISCONNECT:
+            asyncio.create_task(self.close(code=1013, reason="Slow consumer"))
+            return False
+        if self.overflow_policy == OVERFLOW_RESYNC:
+            self._clear_queue()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+            return True
+        self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        return True
+    async def close(self, code: int = 1000, reason: str = ""):
+        if self.closed:
+            return
+        self.closed = True
+        if self.writer_task:
+            self.writer_task.cancel()
+        self._clear_queue()
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[int, list[WebSocket]] = {}
-    async def connect(self, board_id: int, websocket: WebSocket):
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        overflow_policy: str = OVERFLOW_DROP_OLDEST,
+        batch_window_seconds: float = 0.04
+    ):
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.batch_window_seconds = batch_window_seconds
+        self.active_connections: dict[int, list[ClientConnection]] = {}
+        self._pending_events: dict[int, list[str]] = {}
+        self._flush_tasks: dict[int, asyncio.Task] = {}
+    async def connect(self, board_id: int, websocket: WebSocket) -> ClientConnection:
         await websocket.accept()
+        connection = ClientConnection(websocket, self.max_queue_size, self.overflow_policy)
+        connection.start()
         if board_id not in self.active_connections:
             self.active_connections[board_id] = []
-        self.active_connections[board_id].append(websocket)
+        self.active_connections[board_id].append(connection)
+        return connection
     def disconnect(self, board_id: int, websocket: WebSocket):
         if board_id in self.active_connections:
-            self.active_connections[board_id].remove(websocket)
+            for connection in self.active_connections[board_id]:
+                if connection.websocket is websocket:
+                    self.active_connections[board_id].remove(connection)
+                    if connection.writer_task:
+                        connection.writer_task.cancel()
+                    break
             if not self.active_connections[board_id]:
                 del self.active_connections[board_id]
-manager = ConnectionManager()
+    async def broadcast(self, board_id: int, message: str):
+        for connection in list(self.active_connections.get(board_id, [])):
+            if not connection.enqueue(message):
+                self.disconnect(board_id, connection.websocket)
+    def publish(self, board_id: int, message: str):
+        if board_id not in self.active_connections:
+            return
+        if self.batch_window_seconds <= 0:
+            asyncio.create_task(self.broadcast(board_id, message))
+            return
+        self._pending_events.setdefault(board_id, []).append(message)
+        if board_id not in self._flush_tasks:
+            self._flush_tasks[board_id] = asyncio.create_task(self._flush_after_window(board_id))
+    async def _flush_after_window(self, board_id: int):
+        try:
+            await asyncio.sleep(self.batch_window_seconds)
+        finally:
+            self._flush_tasks.pop(board_id, None)
+            messages = self._pending_events.pop(board_id, [])
+        if not messages:
+            return
+        if len(messages) == 1:
+            await self.broadcast(board_id, messages[0])
+            return
+        events = []
+        for message in messages:
+            try:
+                events.append(json.loads(message))
+            except json.JSONDecodeError:
+                logger.warning(f"Dropping malformed event for board {board_id}")
+        events = coalesce_events(events)
+        frame = json.dumps(events[0] if len(events) == 1 else events, default=str)
+        await self.broadcast(board_id, frame)
+manager = ConnectionManager(
+    max_queue_size=settings.WS_SEND_QUEUE_SIZE,
+    overflow_policy=settings.WS_OVERFLOW_POLICY,
+    batch_window_seconds=settings.WS_BATCH_WINDOW_MS / 1000
+)
+async def listen_for_notifications(redis: Redis):
+    while True:
+        if redis_breaker.is_open:
+            await asyncio.sleep(redis_breaker.recovery_timeout_seconds)
+            continue
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.psubscribe(NOTIFICATION_CHANNEL_PATTERN)
+            redis_breaker.record_success()
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                board_id = int(channel.split(":")[1])
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                seq = extract_seq(data)
+                if seq is not None:
+                    replay_buffer.record(board_id, seq, data)
+                manager.publish(board_id, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notification listener error: {e}")
+            redis_breaker.record_failure()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
 @router.websocket("/ws/boards/{board_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
     board_id: int,
     token: str = Query(...),
-    db: Session = Depends(get_db)
+    last_seq: Optional[int] = Query(None)
 ):
     try:
         payload = verify_token(token)
@@ -37,27 +226,43 @@ async def websocket_endpoint(
     except JWTError:
         await websocket.close(code=1008, reason="Invalid token")
         return
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        await websocket.close(code=1008, reason="User not found")
-        return
-    board_service = BoardService(db)
-    try:
-        board = await board_service.get_board(board_id)
-        if not board or not any(member.user_id == user.id for member in board.members):
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.id == int(user_id)))).scalar_one_or_none()
+        if not user:
+            await websocket.close(code=1008, reason="User not found")
+            return
+        try:
+            await BoardService.get_board(db, board_id, user)
+        except (NotFoundException, PermissionException):
             await websocket.close(code=1008, reason="Access denied")
             return
-    except Exception:
-        await websocket.close(code=1011, reason="Internal error")
-        return
-    await manager.connect(board_id, websocket)
+        except Exception:
+            await websocket.close(code=1011, reason="Internal error")
+            return
+    try:
+        current_seq = int(await redis_breaker.call(redis_client.get, board_sequence_key(board_id)) or 0)
+    except CircuitOpenError:
+        current_seq = 0
+    except Exception as e:
+        logger.warning(f"Sequence lookup failed for board {board_id}: {e}")
+        current_seq = 0
+    connection = await manager.connect(board_id, websocket)
+    if last_seq is not None:
+        missed = replay_buffer.since(board_id, last_seq, current_seq)
+        if missed is None:
+            async with AsyncSessionLocal() as db:
+                snapshot = await BoardService.get_board_snapshot(db, board_id, user)
+            connection.enqueue(f'{{"type":"snapshot","seq":{current_seq},"board":{snapshot.decode()}}}')
+        else:
+            for message in missed:
+                connection.enqueue(message)
     try:
         while True:
             data = await websocket.receive_text()
             try:
                 message = json.loads(data)
                 if message.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
+                    connection.enqueue(json.dumps({"type": "pong"}))
             except json.JSONDecodeError:
                 pass
     except WebSocketDisconnect:
@@ -1,10 +1,12 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import jwt
-from auth.jwt_handler import decode_token, verify_token
+from auth.jwt_handler import verify_token
+from auth.principal_cache import principal_cache
 from models import User
+from schemas import UserPrincipal
 from database import get_db
 from repositories.user_repository import UserRepository
 security = HTTPBearer()
@@ -12,8 +14,8 @@ async def get_token(credentials: HTTPAuthorizationCredentials = Depends(security
     return credentials.credentials
 async def get_current_user(
     token: str = Depends(get_token),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> UserPrincipal:
     try:
         payload = verify_token(token)
         user_id: Optional[str] = payload.get("sub")
@@ -29,20 +31,25 @@ async def get_current_user(
             detail="Token invalide",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    principal = await principal_cache.get(int(user_id))
+    if principal is not None:
+        return principal
     user_repository = UserRepository(db)
-    user = user_repository.get_by_id(int(user_id))
+    user = await user_repository.get_by_id(int(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Utilisateur non trouvé",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+    principal = UserPrincipal.model_validate(user)
+    await principal_cache.set(principal)
+    return principal
+async def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Utilisateur inactif")
     return current_user
-async def get_current_superuser(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_superuser(current_user: UserPrincipal = Depends(get_current_active_user)) -> UserPrincipal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -52,10 +59,10 @@ async def get_current_superuser(current_user: User = Depends(get_current_active_
 async def get_current_board_member(
     board_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     user_repository = UserRepository(db)
-    if not user_repository.is_board_member(current_user.id, board_id):
+    if not await user_repository.is_board_member(current_user.id, board_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Accès refusé à ce board"
@@ -64,10 +71,10 @@ async def get_current_board_member(
 async def get_current_board_admin(
     board_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     user_repository = UserRepository(db)
-    if not user_repository.is_board_admin(current_user.id, board_id):
+    if not await user_repository.is_board_admin(current_user.id, board_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permissions administrateur requises pour ce board"
@@ -75,7 +82,7 @@ async def get_current_board_admin(
     return current_user
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     if not credentials:
         return None
@@ -86,6 +93,6 @@ async def get_optional_current_user(
         if user_id is None:
             return None
         user_repository = UserRepository(db)
-        return user_repository.get_by_id(int(user_id))
+        return await user_repository.get_by_id(int(user_id))
     except jwt.PyJWTError:
         return None
\ No newline at end of file
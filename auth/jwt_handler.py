@@ -1,20 +1,61 @@
+import hashlib
+import hmac
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Any
 import jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import User
-from schemas import TokenData
+from schemas import TokenData, UserPrincipal
 from config import settings
-from database import get_db
-SECRET_KEY = settings.JWT_SECRET_KEY
+from database import get_db, get_unit_of_work
+from auth.principal_cache import principal_cache
+from repositories.refresh_session_repository import RefreshSessionRepository
+SECRET_KEY = settings.JWT_SECRET
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+class TokenClaimsCache:
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, TokenData]] = OrderedDict()
+        self._lock = threading.Lock()
+    def _key(self, token: str, token_type: str) -> bytes:
+        return hashlib.sha256(f"{token_type}:{token}".encode()).digest()
+    def get(self, token: str, token_type: str) -> Optional[TokenData]:
+        key = self._key(token, token_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    def put(self, token: str, token_type: str, expires_at: float, token_data: TokenData) -> None:
+        key = self._key(token, token_type)
+        with self._lock:
+            self._entries[key] = (expires_at, token_data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+token_claims_cache = TokenClaimsCache(max_entries=settings.JWT_CLAIMS_CACHE_SIZE)
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -23,9 +64,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 def verify_token(token: str, token_type: str = "access") -> TokenData:
+    cached = token_claims_cache.get(token, token_type)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         if payload.get("type") != token_type:
@@ -33,50 +77,62 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
         user_id: Optional[str] = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: no subject.")
-        return TokenData(user_id=user_id)
+        token_data = TokenData(user_id=user_id)
+        if payload.get("exp") is not None:
+            token_claims_cache.put(token, token_type, float(payload["exp"]), token_data)
+        return token_data
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired.")
     except jwt.PyJWTError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Could not validate credentials: {str(e)}")
-def hash_refresh_token(token: str) -> str:
-    return pwd_context.hash(token)
-def verify_refresh_token_hash(token: str, hashed_token: str) -> bool:
-    return pwd_context.verify(token, hashed_token)
-def store_refresh_token(user_id: int, refresh_token: str, db: Session) -> None:
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    user.refresh_token_hash = hash_refresh_token(refresh_token)
-    db.commit()
-def invalidate_refresh_token(user_id: int, db: Session) -> None:
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        user.refresh_token_hash = None
-        db.commit()
-def refresh_access_token(refresh_token: str, db: Session) -> dict[str, str]:
+def refresh_token_fingerprint(token: str) -> str:
+    return hmac.new(settings.REFRESH_TOKEN_HMAC_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+async def store_refresh_token(user_id: int, refresh_token: str, db: AsyncSession, family_id: Optional[str] = None) -> None:
+    await RefreshSessionRepository(db).create(
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4().hex,
+        token_fingerprint=refresh_token_fingerprint(refresh_token),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    await get_unit_of_work(db).commit()
+async def invalidate_refresh_token(user_id: int, db: AsyncSession) -> None:
+    await RefreshSessionRepository(db).revoke_user(user_id)
+    await get_unit_of_work(db).commit()
+async def refresh_access_token(refresh_token: str, db: AsyncSession) -> dict[str, str]:
     token_data = verify_token(refresh_token, token_type="refresh")
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if not user or not user.refresh_token_hash:
+    fingerprint = refresh_token_fingerprint(refresh_token)
+    session_repo = RefreshSessionRepository(db)
+    session = await session_repo.get_by_fingerprint(fingerprint)
+    if not session or str(session.user_id) != str(token_data.user_id) or not hmac.compare_digest(session.token_fingerprint, fingerprint):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token not found for user.")
-    if not verify_refresh_token_hash(refresh_token, user.refresh_token_hash):
-        invalidate_refresh_token(user.id, db)
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token mismatch. Possible token theft.")
-    new_access_token = create_access_token({"sub": str(user.id)})
-    new_refresh_token = create_refresh_token({"sub": str(user.id)})
-    store_refresh_token(user.id, new_refresh_token, db)
+    if session.rotated_at is not None or session.revoked_at is not None:
+        await session_repo.revoke_family(session.family_id)
+        await get_unit_of_work(db).commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected. Possible token theft.")
+    if session.expires_at <= datetime.utcnow():
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired.")
+    session.rotated_at = datetime.utcnow()
+    new_access_token = create_access_token({"sub": str(session.user_id)})
+    new_refresh_token = create_refresh_token({"sub": str(session.user_id)})
+    await store_refresh_token(session.user_id, new_refresh_token, db, family_id=session.family_id)
     return {
         "access_token": new_access_token,
         "refresh_token": new_refresh_token,
         "token_type": "bearer"
     }
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)) -> UserPrincipal:
     token = credentials.credentials
     token_data = verify_token(token, token_type="access")
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    principal = await principal_cache.get(int(token_data.user_id))
+    if principal is not None:
+        return principal
+    user = (await db.execute(select(User).where(User.id == int(token_data.user_id)))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+    principal = UserPrincipal.model_validate(user)
+    await principal_cache.set(principal)
+    return principal
+async def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
\ No newline at end of file
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+from config import settings
+from utils.exceptions import ServiceUnavailableError
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _hash_secret(secret: str) -> str:
+    return pwd_context.hash(secret)
+def _verify_secret(secret: str, hashed_secret: str) -> bool:
+    return pwd_context.verify(secret, hashed_secret)
+class PasswordHasher:
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, executor_type: str = "thread", retry_after_seconds: int = 1):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor_type = executor_type
+        self.retry_after_seconds = retry_after_seconds
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
+        return self._executor
+    async def _run(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceUnavailableError(
+                    detail="Authentication service is busy, please retry",
+                    retry_after=self.retry_after_seconds
+                )
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+    async def hash(self, secret: str) -> str:
+        return await self._run(_hash_secret, secret)
+    async def verify(self, secret: str, hashed_secret: str) -> bool:
+        return await self._run(_verify_secret, secret, hashed_secret)
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"pending": self.pending, "rejected": self.rejected, "completed": self.completed}
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    executor_type=settings.PASSWORD_HASH_EXECUTOR
+)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from redis.asyncio import Redis
+from config import settings
+from schemas.user import UserPrincipal
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.redis_client import redis_client, redis_breaker
+logger = logging.getLogger(__name__)
+class PrincipalCache:
+    def __init__(
+        self,
+        redis: Optional[Redis],
+        breaker: CircuitBreaker,
+        ttl_seconds: int = 60,
+        local_ttl_seconds: int = 5,
+        max_entries: int = 10000
+    ):
+        self.redis = redis
+        self.breaker = breaker
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.max_entries = max_entries
+        self._local: OrderedDict[int, tuple[float, UserPrincipal]] = OrderedDict()
+        self._tombstones: dict[int, float] = {}
+        self._lock = threading.Lock()
+    def _key(self, user_id: int) -> str:
+        return f"user:{user_id}:principal"
+    def _get_local(self, user_id: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+            return entry[1]
+    def _put_local(self, principal: UserPrincipal) -> None:
+        with self._lock:
+            self._local[principal.id] = (time.monotonic() + self.local_ttl_seconds, principal)
+            self._local.move_to_end(principal.id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+    def _is_tombstoned(self, user_id: int) -> bool:
+        with self._lock:
+            expires_at = self._tombstones.get(user_id)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._tombstones[user_id]
+                return False
+            return True
+    def _put_tombstone(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for expired in [key for key, expires_at in self._tombstones.items() if expires_at <= now]:
+                del self._tombstones[expired]
+            self._tombstones[user_id] = now + self.ttl_seconds
+    async def get(self, user_id: int) -> Optional[UserPrincipal]:
+        principal = self._get_local(user_id)
+        if principal is not None or self.redis is None or self._is_tombstoned(user_id):
+            return principal
+        try:
+            payload = await self.breaker.call(self.redis.get, self._key(user_id))
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            logger.warning(f"Principal cache lookup failed for user {user_id}: {e}")
+            return None
+        if payload is None:
+            return None
+        principal = UserPrincipal.model_validate_json(payload)
+        self._put_local(principal)
+        return principal
+    async def set(self, principal: UserPrincipal) -> None:
+        self._put_local(principal)
+        if self.redis is None:
+            return
+        try:
+            await self.breaker.call(self.redis.set, self._key(principal.id), principal.model_dump_json(), ex=self.ttl_seconds)
+        except CircuitOpenError:
+            return
+        except Exception as e:
+            logger.warning(f"Principal cache store failed for user {principal.id}: {e}")
+            return
+        with self._lock:
+            self._tombstones.pop(principal.id, None)
+    async def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._local.pop(user_id, None)
+        if self.redis is None:
+            return
+        try:
+            await self.breaker.call(self.redis.delete, self._key(user_id))
+        except Exception as e:
+            logger.error(f"Principal cache invalidation failed for user {user_id}, bypassing Redis locally: {e}")
+            self._put_tombstone(user_id)
+principal_cache = PrincipalCache(
+    redis_client if settings.PRINCIPAL_CACHE_REDIS else None,
+    redis_breaker,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    local_ttl_seconds=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS
+)
\ No newline at end of file
@@ -1,20 +1,58 @@
+import asyncio
 from fastapi import FastAPI
-from middleware.cors import add_cors_middleware
-from middleware.logging import LoggingMiddleware
+from middleware.cors import setup_cors
+from middleware.logging import LoggingMiddleware, logger
 from api.v1.api import api_router
 from config import settings
+from services.rank_rebalancer import rank_rebalancer
+from api.v1.endpoints.websocket import listen_for_notifications, manager
+from utils.redis_client import redis_client, redis_breaker
+from auth.jwt_handler import token_claims_cache
+from auth.password_hasher import password_hasher
+from services.audit_writer import audit_writer
+from services.outbox_relay import outbox_relay
+from services.board_change_retention import board_change_retention
+from services.refresh_session_cleanup import refresh_session_cleanup
 import uvicorn
 app = FastAPI(
     title=settings.APP_TITLE,
     version=settings.APP_VERSION,
     description=settings.APP_DESCRIPTION
 )
-add_cors_middleware(app)
+setup_cors(app)
 app.add_middleware(LoggingMiddleware)
 app.include_router(api_router, prefix="/api/v1")
+@app.on_event("startup")
+async def start_background_tasks():
+    outbox_relay.set_local_sink(manager.publish)
+    app.state.rank_rebalancer_task = asyncio.create_task(rank_rebalancer.run())
+    app.state.notification_listener_task = asyncio.create_task(listen_for_notifications(redis_client))
+    app.state.audit_writer_task = asyncio.create_task(audit_writer.run())
+    app.state.outbox_relay_task = asyncio.create_task(outbox_relay.run())
+    app.state.board_change_retention_task = asyncio.create_task(board_change_retention.run())
+    app.state.refresh_session_cleanup_task = asyncio.create_task(refresh_session_cleanup.run())
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    app.state.rank_rebalancer_task.cancel()
+    app.state.notification_listener_task.cancel()
+    app.state.outbox_relay_task.cancel()
+    app.state.board_change_retention_task.cancel()
+    app.state.refresh_session_cleanup_task.cancel()
+    password_hasher.shutdown()
+    app.state.audit_writer_task.cancel()
+    await audit_writer.close()
+    await logger.complete()
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+@app.get("/metrics")
+async def metrics():
+    return {
+        "jwt_claims_cache": token_claims_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "outbox_relay": outbox_relay.stats(),
+        "redis_breaker": redis_breaker.stats()
+    }
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
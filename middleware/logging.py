@@ -1,18 +1,19 @@
+import random
 import time
 import uuid
-from typing import Optional, Any
 from fastapi import Request
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
 logger.remove()
 logger.add(
     "logs/app.log",
     rotation="500 MB",
     retention="10 days",
-    level="INFO",
+    level=settings.LOG_LEVEL,
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-    serialize=True
+    serialize=True,
+    enqueue=True
 )
 logger.add(
     "logs/error.log",
@@ -20,46 +21,71 @@ logger.add(
     retention="10 days",
     level="ERROR",
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-    serialize=True
+    serialize=True,
+    enqueue=True
 )
+CORRELATION_ID_HEADER = b"x-correlation-id"
+MAX_CORRELATION_ID_LENGTH = 128
 def get_correlation_id(request: Request) -> str:
     return getattr(request.state, "correlation_id", "unknown")
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
-        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
-        start_time = time.time()
-        client_host = request.client.host if request.client else None
-        logger.bind(
-            correlation_id=correlation_id,
-            method=request.method,
-            url=str(request.url),
-            path=request.url.path,
-            query_params=str(request.query_params),
-            client_ip=client_host,
-            user_agent=request.headers.get("user-agent"),
-        ).info("Request started")
+class LoggingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        success_sample_rate: float = settings.LOG_SUCCESS_SAMPLE_RATE,
+        slow_request_ms: float = settings.LOG_SLOW_REQUEST_MS
+    ):
+        self.app = app
+        self.success_sample_rate = success_sample_rate
+        self.slow_request_seconds = slow_request_ms / 1000
+    def _should_log(self, status_code: int, process_time: float) -> bool:
+        if status_code >= 400 or process_time >= self.slow_request_seconds:
+            return True
+        return self.success_sample_rate >= 1 or random.random() < self.success_sample_rate
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        correlation_id = None
+        for name, value in scope["headers"]:
+            if name == CORRELATION_ID_HEADER:
+                correlation_id = value.decode("latin-1")[:MAX_CORRELATION_ID_LENGTH]
+                break
+        correlation_id = correlation_id or str(uuid.uuid4())
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        start_time = time.perf_counter()
+        status_code = 500
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (CORRELATION_ID_HEADER, correlation_id.encode("latin-1")),
+                    (b"x-process-time", str(round(time.perf_counter() - start_time, 4)).encode())
+                ]
+            await send(message)
         try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            logger.bind(
-                correlation_id=correlation_id,
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                process_time_seconds=round(process_time, 4),
-            ).info("Request completed")
-            response.headers["X-Correlation-ID"] = correlation_id
-            response.headers["X-Process-Time"] = str(round(process_time, 4))
-            return response
+            await self.app(scope, receive, send_with_headers)
         except Exception as exc:
-            process_time = time.time() - start_time
             logger.bind(
                 correlation_id=correlation_id,
-                method=request.method,
-                url=str(request.url),
-                process_time_seconds=round(process_time, 4),
+                method=scope["method"],
+                path=scope["path"],
+                process_time_seconds=round(time.perf_counter() - start_time, 4),
                 exception_type=type(exc).__name__,
                 exception_message=str(exc),
             ).error("Request failed")
-            raise
\ No newline at end of file
+            raise
+        process_time = time.perf_counter() - start_time
+        if self._should_log(status_code, process_time):
+            client = scope.get("client")
+            logger.bind(
+                correlation_id=correlation_id,
+                method=scope["method"],
+                path=scope["path"],
+                query_string=scope["query_string"].decode("latin-1"),
+                client_ip=client[0] if client else None,
+                status_code=status_code,
+                process_time_seconds=round(process_time, 4),
+            ).info("Request completed")
\ No newline at end of file
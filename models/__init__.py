@@ -1,22 +1,36 @@
 from .user import User
 from .board import Board
+from .board_member import BoardMember
+from .board_invitation import BoardInvitation
 from .list import List
 from .card import Card
 from .comment import Comment
 from .label import Label
+from .board_change import BoardChange
+from .refresh_session import RefreshSession
+from .outbox_event import OutboxEvent
+from .card_history import CardHistory
+from .board_activity import BoardActivity
 from .association_tables import (
     board_members,
-    card_labels,
-    card_assignees
+    card_assignees,
+    cards_labels
 )
 __all__ = [
     "User",
     "Board",
+    "BoardMember",
+    "BoardInvitation",
     "List",
     "Card",
     "Comment",
     "Label",
+    "BoardChange",
+    "RefreshSession",
+    "OutboxEvent",
+    "CardHistory",
+    "BoardActivity",
     "board_members",
-    "card_labels",
-    "card_assignees"
+    "card_assignees",
+    "cards_labels"
 ]
\ No newline at end of file
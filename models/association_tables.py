@@ -1,10 +1,17 @@
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, String
 from database import Base
 board_members = Table(
     'board_members',
     Base.metadata,
     Column('board_id', ForeignKey('boards.id'), primary_key=True),
-    Column('user_id', ForeignKey('users.id'), primary_key=True)
+    Column('user_id', ForeignKey('users.id'), primary_key=True),
+    Column('role', String(20), nullable=False, default='member', server_default='member')
+)
+card_assignees = Table(
+    'card_assignees',
+    Base.metadata,
+    Column('card_id', ForeignKey('cards.id', ondelete='CASCADE'), primary_key=True),
+    Column('user_id', ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
 )
 cards_labels = Table(
     'cards_labels',
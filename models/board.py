@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database import Base
 from models.user import User
@@ -10,8 +10,13 @@ class Board(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    members_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    changes_watermark: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     owner: Mapped[User] = relationship("User", back_populates="owned_boards")
     lists: Mapped[list["List"]] = relationship("List", back_populates="board", cascade="all, delete-orphan")
+    labels: Mapped[list["Label"]] = relationship("Label", back_populates="board", cascade="all, delete-orphan")
     members: Mapped[list[User]] = relationship("User", secondary=board_members, back_populates="member_boards")
\ No newline at end of file
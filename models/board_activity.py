@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Any
+from sqlalchemy import Integer, String, DateTime, Index, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+class BoardActivity(Base):
+    __tablename__ = "board_activities"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    board_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
+    details: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    __table_args__ = (
+        Index("idx_board_activities_board_id_timestamp", "board_id", "timestamp"),
+    )
\ No newline at end of file
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+class BoardChange(Base):
+    __tablename__ = "board_changes"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False, default="upsert")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    __table_args__ = (
+        Index("idx_board_changes_board_id_version", "board_id", "version"),
+        Index("idx_board_changes_created_at", "created_at"),
+    )
\ No newline at end of file
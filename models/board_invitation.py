@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+class BoardInvitation(Base):
+    __tablename__ = "board_invitations"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"), nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False, default="member")
+    token: Mapped[str] = mapped_column(String(36), nullable=False, unique=True)
+    invited_by: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    used: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    used_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    declined: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    declined_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
\ No newline at end of file
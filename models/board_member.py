@@ -0,0 +1,4 @@
+from database import Base
+from models.association_tables import board_members
+class BoardMember(Base):
+    __table__ = board_members
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, relationship
 from datetime import datetime
 from database import Base
@@ -9,4 +9,8 @@ class Comment(Base):
     card_id: Mapped[int] = Column(Integer, ForeignKey("cards.id"), nullable=False)
     user_id: Mapped[int] = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow)
-    user: Mapped["User"] = relationship("User")
\ No newline at end of file
+    card: Mapped["Card"] = relationship("Card", back_populates="comments")
+    user: Mapped["User"] = relationship("User")
+    __table_args__ = (
+        Index("idx_comments_card_id_created_at_id", "card_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey, DateTime
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from database import Base
@@ -6,7 +6,13 @@ class List(Base):
     __tablename__ = "lists"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    position: Mapped[str] = mapped_column(String(255, collation="C"), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
     board_id: Mapped[int] = mapped_column(ForeignKey("boards.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    cards: Mapped[list["Card"]] = relationship("Card", back_populates="list", cascade="all, delete-orphan")
\ No newline at end of file
+    board: Mapped["Board"] = relationship("Board", back_populates="lists")
+    cards: Mapped[list["Card"]] = relationship("Card", back_populates="list", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("idx_lists_board_id_position", "board_id", "position"),
+    )
+    __mapper_args__ = {"version_id_col": version}
\ No newline at end of file
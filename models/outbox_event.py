@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, Integer, Text, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    board_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    __table_args__ = (
+        Index("idx_outbox_events_undelivered", "id", postgresql_where=text("delivered_at IS NULL")),
+        Index("idx_outbox_events_delivered_at", "delivered_at"),
+    )
\ No newline at end of file
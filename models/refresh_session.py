@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+class RefreshSession(Base):
+    __tablename__ = "refresh_sessions"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False)
+    token_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    rotated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    __table_args__ = (
+        Index("idx_refresh_sessions_token_fingerprint", "token_fingerprint", unique=True),
+        Index("idx_refresh_sessions_family_id", "family_id"),
+        Index("idx_refresh_sessions_user_id", "user_id"),
+    )
\ No newline at end of file
@@ -10,5 +10,6 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     avatar_url = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    boards: Mapped[list["Board"]] = relationship("Board", back_populates="owner", cascade="all, delete-orphan")
-    cards: Mapped[list["Card"]] = relationship("Card", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    owned_boards: Mapped[list["Board"]] = relationship("Board", back_populates="owner", cascade="all, delete-orphan")
+    member_boards: Mapped[list["Board"]] = relationship("Board", secondary="board_members", back_populates="members")
+    assigned_cards: Mapped[list["Card"]] = relationship("Card", back_populates="assigned_user")
\ No newline at end of file
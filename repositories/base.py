@@ -1,16 +1,46 @@
 from typing import TypeVar, Type, Generic, Optional, Any, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, func
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import Select, select, insert, update, delete, func, tuple_
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+from pydantic import BaseModel
+from utils.pagination import encode_cursor, decode_cursor
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
-class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], db_session: AsyncSession):
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> tuple[Sequence[Any], Optional[str]]:
+    if cursor is not None:
+        sort_value, last_id = decode_cursor(cursor, sort_column)
+        position = tuple_(sort_column, id_column)
+        bound = tuple_(sort_value, last_id)
+        query = query.where(position < bound if descending else position > bound)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
         self.model = model
-        self.db_session = db_session
+        self.db = db
     async def get(self, id: Any) -> Optional[ModelType]:
         query = select(self.model).where(self.model.id == id)
-        result = await self.db_session.execute(query)
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
+    async def get_by_id(self, id: Any) -> Optional[ModelType]:
+        return await self.get(id)
     async def get_multi(
         self, skip: int = 0, limit: int = 100, **filters: Any
     ) -> Sequence[ModelType]:
@@ -18,31 +48,50 @@ class BaseRepository(Generic[ModelType]):
         for key, value in filters.items():
             query = query.where(getattr(self.model, key) == value)
         query = query.offset(skip).limit(limit)
-        result = await self.db_session.execute(query)
+        result = await self.db.execute(query)
         return result.scalars().all()
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        descending: bool = False,
+        **filters: Any
+    ) -> tuple[Sequence[ModelType], Optional[str]]:
+        query = select(self.model)
+        for key, value in filters.items():
+            query = query.where(getattr(self.model, key) == value)
+        return await paginate(
+            self.db,
+            query,
+            getattr(self.model, sort_by),
+            self.model.id,
+            limit=limit,
+            cursor=cursor,
+            descending=descending
+        )
+    async def get_all(self, skip: int = 0, limit: int = 100) -> Sequence[ModelType]:
+        return await self.get_multi(skip=skip, limit=limit)
     async def create(self, obj_in: dict[str, Any]) -> ModelType:
         stmt = insert(self.model).values(**obj_in).returning(self.model)
-        result = await self.db_session.execute(stmt)
-        await self.db_session.commit()
+        result = await self.db.execute(stmt)
         return result.scalar_one()
-    async def update(self, db_obj: ModelType, obj_in: dict[str, Any]) -> ModelType:
+    async def update(self, id: Any, obj_in: dict[str, Any]) -> Optional[ModelType]:
         stmt = (
             update(self.model)
-            .where(self.model.id == db_obj.id)
+            .where(self.model.id == id)
             .values(**obj_in)
             .returning(self.model)
         )
-        result = await self.db_session.execute(stmt)
-        await self.db_session.commit()
-        return result.scalar_one()
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
     async def delete(self, id: Any) -> Optional[ModelType]:
         stmt = delete(self.model).where(self.model.id == id).returning(self.model)
-        result = await self.db_session.execute(stmt)
-        await self.db_session.commit()
+        result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     async def count(self, **filters: Any) -> int:
         query = select(func.count()).select_from(self.model)
         for key, value in filters.items():
             query = query.where(getattr(self.model, key) == value)
-        result = await self.db_session.execute(query)
+        result = await self.db.execute(query)
         return result.scalar()
\ No newline at end of file
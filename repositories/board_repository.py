@@ -1,71 +1,146 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import select
-from models import Board, User, List, Card, Label
+from functools import partial
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import func, insert, or_, select, update
+from database import get_unit_of_work
+from models import Board, User, List, Card, Label, BoardChange, BoardMember, board_members
 from schemas import BoardCreate, BoardUpdate
 from repositories.base import BaseRepository
 class BoardRepository(BaseRepository[Board, BoardCreate, BoardUpdate]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(db, Board)
-    def get_with_relations(self, board_id: int) -> Optional[Board]:
+    async def get_with_relations(self, board_id: int) -> Optional[Board]:
         query = select(Board).where(Board.id == board_id).options(
             joinedload(Board.owner),
-            joinedload(Board.members),
+            selectinload(Board.members),
             selectinload(Board.lists).selectinload(List.cards).selectinload(Card.labels),
             selectinload(Board.lists).selectinload(List.cards).selectinload(Card.assignees),
             selectinload(Board.labels)
         )
-        result = self.db.execute(query)
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
-    def get_by_owner(self, owner_id: int) -> List[Board]:
+    async def get_version_stamp(self, board_id: int, for_update: bool = False):
+        query = select(
+            Board.id,
+            Board.version,
+            Board.members_version,
+            Board.owner_id,
+            Board.is_public
+        ).where(Board.id == board_id)
+        if for_update:
+            query = query.with_for_update(key_share=True)
+        return (await self.db.execute(query)).one_or_none()
+    async def record_change(self, board_id: int, entity_type: str, entity_id: int, operation: str = "upsert") -> None:
+        pending = self.db.info.get("board_changes")
+        if pending is None:
+            pending = self.db.info["board_changes"] = []
+            get_unit_of_work(self.db).before_commit(partial(BoardRepository.assign_versions, self.db))
+        pending.append((board_id, entity_type, entity_id, operation))
+    @staticmethod
+    async def lock_boards(db: AsyncSession, board_ids: set[int]) -> None:
+        if board_ids:
+            await db.execute(
+                select(Board.id).where(Board.id.in_(board_ids)).order_by(Board.id).with_for_update(key_share=True)
+            )
+    @staticmethod
+    async def assign_versions(db: AsyncSession) -> None:
+        pending = db.info.pop("board_changes", [])
+        rows = []
+        for board_id in sorted({change[0] for change in pending}):
+            version = (await db.execute(
+                update(Board).where(Board.id == board_id).values(version=Board.version + 1).returning(Board.version)
+            )).scalar_one_or_none()
+            if version is None:
+                continue
+            rows.extend(
+                {
+                    "board_id": board_id,
+                    "version": version,
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "operation": operation
+                }
+                for change_board_id, entity_type, entity_id, operation in pending
+                if change_board_id == board_id
+            )
+        if rows:
+            await db.execute(insert(BoardChange), rows)
+    async def bump_members_version(self, board_id: int) -> None:
+        await self.db.execute(update(Board).where(Board.id == board_id).values(members_version=Board.members_version + 1))
+    @staticmethod
+    def readable_by(user_id: int):
+        return or_(
+            Board.is_public.is_(True),
+            Board.owner_id == user_id,
+            Board.id.in_(select(board_members.c.board_id).where(board_members.c.user_id == user_id))
+        )
+    async def get_member_roles(self, board_id: int) -> dict[int, str]:
+        query = select(BoardMember.user_id, BoardMember.role).where(BoardMember.board_id == board_id)
+        return {user_id: role for user_id, role in (await self.db.execute(query)).all()}
+    async def get_changes_since(self, board_id: int, since: int) -> list[BoardChange]:
+        query = select(BoardChange).where(
+            BoardChange.board_id == board_id,
+            BoardChange.version > since
+        ).order_by(BoardChange.version)
+        return (await self.db.execute(query)).scalars().all()
+    async def get_by_owner(self, owner_id: int) -> list[Board]:
         query = select(Board).where(Board.owner_id == owner_id).options(
             joinedload(Board.owner),
-            joinedload(Board.members),
+            selectinload(Board.members),
             selectinload(Board.lists),
             selectinload(Board.labels)
         ).order_by(Board.created_at.desc())
-        result = self.db.execute(query)
+        result = await self.db.execute(query)
         return result.scalars().all()
-    def get_by_member(self, user_id: int) -> List[Board]:
+    async def get_by_member(self, user_id: int) -> list[Board]:
         query = select(Board).join(Board.members).where(User.id == user_id).options(
             joinedload(Board.owner),
-            joinedload(Board.members),
+            selectinload(Board.members),
             selectinload(Board.lists),
             selectinload(Board.labels)
         ).order_by(Board.created_at.desc())
-        result = self.db.execute(query)
+        result = await self.db.execute(query)
         return result.scalars().all()
-    def create_with_owner(self, board_data: BoardCreate, owner_id: int) -> Board:
+    async def create_with_owner(self, board_data: BoardCreate, owner_id: int) -> Board:
         db_board = Board(**board_data.model_dump(exclude_unset=True), owner_id=owner_id)
         self.db.add(db_board)
-        self.db.flush()
-        self.db.refresh(db_board)
+        await self.db.flush()
+        await self.db.refresh(db_board)
         return db_board
-    def add_member(self, board_id: int, user_id: int) -> bool:
-        board = self.get(board_id)
-        if not board:
-            return False
-        user = self.db.get(User, user_id)
-        if not user:
+    async def get_member(self, board_id: int, user_id: int) -> Optional[BoardMember]:
+        return await self.db.get(BoardMember, (board_id, user_id))
+    async def get_admin_count(self, board_id: int) -> int:
+        query = select(func.count()).select_from(BoardMember).where(
+            BoardMember.board_id == board_id,
+            BoardMember.role == "admin"
+        )
+        return (await self.db.execute(query)).scalar_one()
+    async def add_member(self, board_id: int, user_id: int, role: str = "member") -> bool:
+        if not await self.db.get(Board, board_id) or not await self.db.get(User, user_id):
             return False
-        if user not in board.members:
-            board.members.append(user)
-            self.db.flush()
+        if await self.get_member(board_id, user_id) is None:
+            self.db.add(BoardMember(board_id=board_id, user_id=user_id, role=role))
+            await self.bump_members_version(board_id)
+            await self.db.flush()
         return True
-    def remove_member(self, board_id: int, user_id: int) -> bool:
-        board = self.get(board_id)
-        if not board:
-            return False
-        user = self.db.get(User, user_id)
-        if not user:
+    async def remove_member(self, board_id: int, user_id: int) -> bool:
+        member = await self.get_member(board_id, user_id)
+        if member is None:
             return False
-        if user in board.members:
-            board.members.remove(user)
-            self.db.flush()
-            return True
-        return False
-    def get_board_summary(self, board_id: int) -> Optional[dict]:
-        board = self.get_with_relations(board_id)
+        await self.db.delete(member)
+        await self.bump_members_version(board_id)
+        await self.db.flush()
+        return True
+    async def update_member_role(self, board_id: int, user_id: int, role: str) -> Optional[BoardMember]:
+        member = await self.get_member(board_id, user_id)
+        if member is not None and member.role != role:
+            member.role = role
+            await self.bump_members_version(board_id)
+            await self.db.flush()
+        return member
+    async def get_board_summary(self, board_id: int) -> Optional[dict]:
+        board = await self.get_with_relations(board_id)
         if not board:
             return None
         total_lists = len(board.lists)
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete
+from models import RefreshSession
+class RefreshSessionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    async def create(self, user_id: int, family_id: str, token_fingerprint: str, expires_at: datetime) -> RefreshSession:
+        session = RefreshSession(
+            user_id=user_id,
+            family_id=family_id,
+            token_fingerprint=token_fingerprint,
+            expires_at=expires_at
+        )
+        self.db.add(session)
+        await self.db.flush()
+        return session
+    async def get_by_fingerprint(self, token_fingerprint: str) -> Optional[RefreshSession]:
+        query = select(RefreshSession).where(RefreshSession.token_fingerprint == token_fingerprint).with_for_update()
+        return (await self.db.execute(query)).scalar_one_or_none()
+    async def revoke_family(self, family_id: str) -> None:
+        await self.db.execute(
+            update(RefreshSession)
+            .where(RefreshSession.family_id == family_id, RefreshSession.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+    async def revoke_user(self, user_id: int) -> None:
+        await self.db.execute(
+            update(RefreshSession)
+            .where(RefreshSession.user_id == user_id, RefreshSession.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+    async def delete_expired(self) -> int:
+        result = await self.db.execute(delete(RefreshSession).where(RefreshSession.expires_at < datetime.utcnow()))
+        return result.rowcount
\ No newline at end of file
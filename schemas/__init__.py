@@ -1,16 +1,24 @@
-from schemas.user import UserSchema, UserCreate, UserUpdate, UserResponse
-from schemas.board import BoardSchema, BoardCreate, BoardUpdate, BoardResponse
-from schemas.list import ListSchema, ListCreate, ListUpdate, ListResponse
-from schemas.card import CardSchema, CardCreate, CardUpdate, CardResponse
-from schemas.comment import CommentSchema, CommentCreate, CommentUpdate, CommentResponse
-from schemas.label import LabelSchema, LabelCreate, LabelUpdate, LabelResponse
-from schemas.websocket import WebSocketMessage, WebSocketResponse
+from schemas.user import UserCreate, UserUpdate, UserResponse, UserPrincipal, Token, TokenRefresh, TokenData
+from schemas.card import CardCreate, CardUpdate, CardResponse, CardMove, CardHistoryResponse
+from schemas.list import ListCreate, ListUpdate, ListResponse, ListReorder
+from schemas.board import BoardCreate, BoardUpdate, BoardResponse, BoardMemberAdd, BoardMemberResponse, InvitationCreate, InvitationResponse
+from schemas.comment import CommentCreate, CommentUpdate, CommentResponse
+from schemas.label import LabelCreate, LabelUpdate, LabelResponse
+from schemas.websocket import WebSocketMessage
+from schemas.notification import NotificationType, NotificationData
+from schemas.sync import BoardChangesResponse, Tombstone
+from schemas.pagination import Page
+from schemas.search import CardSearchHit
 __all__ = [
-    "UserSchema", "UserCreate", "UserUpdate", "UserResponse",
-    "BoardSchema", "BoardCreate", "BoardUpdate", "BoardResponse",
-    "ListSchema", "ListCreate", "ListUpdate", "ListResponse",
-    "CardSchema", "CardCreate", "CardUpdate", "CardResponse",
-    "CommentSchema", "CommentCreate", "CommentUpdate", "CommentResponse",
-    "LabelSchema", "LabelCreate", "LabelUpdate", "LabelResponse",
-    "WebSocketMessage", "WebSocketResponse",
+    "UserCreate", "UserUpdate", "UserResponse", "UserPrincipal", "Token", "TokenRefresh", "TokenData",
+    "CardCreate", "CardUpdate", "CardResponse", "CardMove", "CardHistoryResponse",
+    "ListCreate", "ListUpdate", "ListResponse", "ListReorder",
+    "BoardCreate", "BoardUpdate", "BoardResponse", "BoardMemberAdd", "BoardMemberResponse", "InvitationCreate", "InvitationResponse",
+    "CommentCreate", "CommentUpdate", "CommentResponse",
+    "LabelCreate", "LabelUpdate", "LabelResponse",
+    "WebSocketMessage",
+    "NotificationType", "NotificationData",
+    "BoardChangesResponse", "Tombstone",
+    "Page",
+    "CardSearchHit",
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 from typing import Optional
-from schemas import UserResponse
+from schemas.user import UserResponse
+from schemas.list import ListResponse
 class BoardBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
@@ -18,5 +19,30 @@ class BoardResponse(BoardBase):
     created_at: datetime
     updated_at: datetime
     members: list[UserResponse] = Field(default_factory=list)
-    lists: list["ListResponse"] = Field(default_factory=list)
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    lists: list[ListResponse] = Field(default_factory=list)
+    model_config = {"from_attributes": True}
+class BoardMemberAdd(BaseModel):
+    user_id: int
+class BoardMemberResponse(BaseModel):
+    board_id: int
+    user_id: int
+    role: str
+    model_config = ConfigDict(from_attributes=True)
+class InvitationCreate(BaseModel):
+    email: EmailStr
+    role: str = Field("member", pattern="^(admin|member|viewer)$")
+class InvitationResponse(BaseModel):
+    id: int
+    board_id: int
+    email: str
+    role: str
+    expires_at: datetime
+    used: bool
+    declined: bool
+    model_config = ConfigDict(from_attributes=True)
+class BoardImportSummary(BaseModel):
+    board_id: int
+    lists: int
+    labels: int
+    cards: int
+    card_labels: int
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from .user import UserResponse
 from .comment import CommentResponse
 from .label import LabelResponse
@@ -17,15 +17,25 @@ class CardUpdate(BaseModel):
     description: Optional[str] = None
     due_date: Optional[datetime] = None
     list_id: Optional[int] = None
-    position: Optional[int] = None
     assigned_user_id: Optional[int] = None
+class CardMove(BaseModel):
+    new_list_id: int
+    new_position: int = Field(..., ge=0)
 class CardResponse(CardBase):
     id: int
     list_id: int
-    position: int
+    position: str
     assigned_user: Optional[UserResponse] = None
     comments: list[CommentResponse] = []
     labels: list[LabelResponse] = []
     created_at: datetime
     updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+class CardHistoryResponse(BaseModel):
+    id: int
+    card_id: int
+    user_id: int
+    action: str
+    details: dict[str, Any] = {}
+    timestamp: datetime
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
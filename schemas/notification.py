@@ -0,0 +1,22 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from pydantic import BaseModel, Field
+class NotificationType(str, Enum):
+    CARD_CREATED = "card_created"
+    CARD_UPDATED = "card_updated"
+    CARD_MOVED = "card_moved"
+    COMMENT_ADDED = "comment_added"
+    LABEL_ADDED = "label_added"
+    MEMBER_ADDED = "member_added"
+    BOARD_UPDATED = "board_updated"
+class NotificationData(BaseModel):
+    type: NotificationType
+    title: str
+    message: str
+    resource_id: int
+    resource_type: str
+    user_id: int
+    board_id: int
+    additional_data: dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime
\ No newline at end of file
@@ -0,0 +1,6 @@
+from typing import Generic, Optional, TypeVar
+from pydantic import BaseModel
+T = TypeVar("T")
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
\ No newline at end of file
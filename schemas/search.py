@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+class CardSearchHit(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    list_id: int
+    board_id: int
+    rank: float
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
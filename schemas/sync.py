@@ -0,0 +1,27 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from .card import CardResponse
+from .label import LabelResponse
+class BoardFieldsChange(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+class ListChange(BaseModel):
+    id: int
+    name: str
+    board_id: int
+    position: str
+    version: int
+    model_config = ConfigDict(from_attributes=True)
+class Tombstone(BaseModel):
+    entity_type: str
+    entity_id: int
+class BoardChangesResponse(BaseModel):
+    version: int
+    board: Optional[BoardFieldsChange] = None
+    lists: list[ListChange] = []
+    cards: list[CardResponse] = []
+    labels: list[LabelResponse] = []
+    member_ids: list[int] = []
+    deleted: list[Tombstone] = []
\ No newline at end of file
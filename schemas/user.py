@@ -22,9 +22,30 @@ class UserResponse(UserBase):
     created_at: datetime
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
+class UserPrincipal(BaseModel):
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    is_active: bool = True
+    is_verified: bool = False
+    is_superuser: bool = False
+    is_admin: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+class Token(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+class TokenRefresh(BaseModel):
+    refresh_token: str
+class TokenData(BaseModel):
+    user_id: str
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
\ No newline at end of file
@@ -23,6 +23,7 @@ class WebSocketMessage(BaseModel):
     user_id: int
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     board_id: Optional[int] = None
+    seq: Optional[int] = None
 class CardMoveData(BaseModel):
     card_id: int
     from_list_id: int
@@ -0,0 +1,39 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+from config import settings
+class BoardAcl:
+    def __init__(self, owner_id: int, is_public: bool, roles: dict[int, str]):
+        self.owner_id = owner_id
+        self.is_public = is_public
+        self.roles = roles
+    def role_of(self, user_id: int) -> Optional[str]:
+        role = self.roles.get(user_id)
+        if role is None and user_id == self.owner_id:
+            return "admin"
+        return role
+class BoardAclCache:
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[int, BoardAcl]] = OrderedDict()
+        self._lock = threading.Lock()
+    def get(self, board_id: int, members_version: int) -> Optional[BoardAcl]:
+        with self._lock:
+            entry = self._entries.get(board_id)
+            if entry is None or entry[0] != members_version:
+                return None
+            self._entries.move_to_end(board_id)
+            return entry[1]
+    def put(self, board_id: int, members_version: int, acl: BoardAcl) -> None:
+        with self._lock:
+            current = self._entries.get(board_id)
+            if current is not None and current[0] > members_version:
+                return
+            self._entries[board_id] = (members_version, acl)
+            self._entries.move_to_end(board_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    def invalidate(self, board_id: int) -> None:
+        with self._lock:
+            self._entries.pop(board_id, None)
+board_acl_cache = BoardAclCache(max_entries=settings.BOARD_ACL_CACHE_SIZE)
\ No newline at end of file
@@ -0,0 +1,176 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from config import settings
+from database import AsyncSessionLocal
+from models import CardHistory, BoardActivity
+logger = logging.getLogger(__name__)
+AUDIT_MODELS = {
+    "card_history": CardHistory,
+    "board_activity": BoardActivity
+}
+class AuditWriter:
+    def __init__(self, spool_path: str, flush_interval_seconds: float = 0.2, max_batch_size: int = 500):
+        self.spool_path = spool_path
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[str, dict[str, Any]]] = []
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._spool = None
+        self._spool_pid: int | None = None
+    def _process_spool_path(self, pid: int) -> str:
+        root, ext = os.path.splitext(self.spool_path)
+        return f"{root}.{pid}{ext}"
+    def _own_spool_path(self) -> str:
+        return self._process_spool_path(os.getpid())
+    def _open_spool(self):
+        if self._spool is not None and self._spool_pid != os.getpid():
+            self._spool = None
+        if self._spool is None:
+            os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+            self._spool = open(self._own_spool_path(), "a", encoding="utf-8")
+            self._spool_pid = os.getpid()
+        return self._spool
+    def _append_spool(self, kind: str, row: dict[str, Any]) -> None:
+        spool = self._open_spool()
+        spool.write(json.dumps({"kind": kind, "row": row}, default=str) + "\n")
+        spool.flush()
+    def _rewrite_spool(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        own_path = self._own_spool_path()
+        temp_path = f"{own_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as spool:
+            for kind, row in self._pending:
+                spool.write(json.dumps({"kind": kind, "row": row}, default=str) + "\n")
+        os.replace(temp_path, own_path)
+    def _read_spool(self, path: str) -> list[tuple[str, dict[str, Any]]]:
+        entries = []
+        with open(path, encoding="utf-8") as spool:
+            for line in spool:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("kind") in AUDIT_MODELS:
+                    row = entry["row"]
+                    row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+                    entries.append((entry["kind"], row))
+        return entries
+    def _orphaned_spools(self) -> list[str]:
+        root, ext = os.path.splitext(self.spool_path)
+        orphaned = []
+        for path in glob.glob(f"{glob.escape(root)}.*{ext}"):
+            pid = path[len(root) + 1:len(path) - len(ext)]
+            if not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                orphaned.append(path)
+            except PermissionError:
+                continue
+        return orphaned
+    def _load_spool(self) -> None:
+        own_path = self._own_spool_path()
+        if os.path.exists(own_path):
+            self._pending[:0] = self._read_spool(own_path)
+        claimed = []
+        for path in self._orphaned_spools():
+            claimed_path = f"{own_path}.claimed-{os.path.basename(path)}"
+            try:
+                os.rename(path, claimed_path)
+            except FileNotFoundError:
+                continue
+            self._pending.extend(self._read_spool(claimed_path))
+            claimed.append(claimed_path)
+        if claimed:
+            self._rewrite_spool()
+            for claimed_path in claimed:
+                os.remove(claimed_path)
+        if self._pending:
+            logger.info(f"Recovered {len(self._pending)} audit rows from spool")
+    def _record(self, kind: str, row: dict[str, Any]) -> None:
+        row["timestamp"] = datetime.utcnow()
+        self._pending.append((kind, row))
+        try:
+            self._append_spool(kind, row)
+        except OSError as e:
+            logger.error(f"Failed to spool audit row: {e}")
+        if len(self._pending) >= self.max_batch_size:
+            self._wake.set()
+    def record_card_history(self, card_id: int, user_id: int, action: str, details: dict) -> None:
+        self._record("card_history", {"card_id": card_id, "user_id": user_id, "action": action, "details": details})
+    def record_board_activity(self, board_id: int, user_id: int, action: str, details: dict) -> None:
+        self._record("board_activity", {"board_id": board_id, "user_id": user_id, "action": action, "details": details})
+    async def _write(self, batch: list[tuple[str, dict[str, Any]]]) -> None:
+        rows_by_kind: dict[str, list[dict[str, Any]]] = {}
+        for kind, row in batch:
+            rows_by_kind.setdefault(kind, []).append(row)
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                for kind, rows in rows_by_kind.items():
+                    await session.execute(insert(AUDIT_MODELS[kind]), rows)
+    async def _write_individually(self, batch: list[tuple[str, dict[str, Any]]]) -> list[tuple[str, dict[str, Any]]]:
+        for index, (kind, row) in enumerate(batch):
+            try:
+                await self._write([(kind, row)])
+            except (IntegrityError, DataError) as e:
+                logger.error(f"Dropping audit row {kind} {row}: {e}")
+            except Exception as e:
+                logger.error(f"Audit row-by-row retry interrupted, {len(batch) - index} rows kept for the next flush: {e}")
+                return batch[index:]
+        return []
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            written = 0
+            try:
+                while self._pending:
+                    batch = self._pending[:self.max_batch_size]
+                    remaining = []
+                    try:
+                        await self._write(batch)
+                    except (IntegrityError, DataError) as e:
+                        logger.warning(f"Audit batch of {len(batch)} rows rejected, retrying row by row: {e}")
+                        remaining = await self._write_individually(batch)
+                    del self._pending[:len(batch)]
+                    self._pending[:0] = remaining
+                    written += len(batch) - len(remaining)
+                    if remaining:
+                        break
+            finally:
+                if written:
+                    self._rewrite_spool()
+            return written
+    async def run(self) -> None:
+        self._load_spool()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit flush failed: {e}")
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
+audit_writer = AuditWriter(
+    spool_path=settings.AUDIT_SPOOL_PATH,
+    flush_interval_seconds=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+    max_batch_size=settings.AUDIT_BATCH_SIZE
+)
\ No newline at end of file
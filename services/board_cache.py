@@ -0,0 +1,66 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+from redis.asyncio import Redis
+from config import settings
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.redis_client import redis_client, redis_breaker
+logger = logging.getLogger(__name__)
+class BoardSnapshotCache:
+    def __init__(self, redis: Redis, breaker: CircuitBreaker, max_entries: int = 256, ttl_seconds: int = 3600):
+        self.redis = redis
+        self.breaker = breaker
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local: OrderedDict[int, tuple[int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+    def _key(self, board_id: int, version: int) -> str:
+        return f"board:{board_id}:snapshot:{version}"
+    def _get_local(self, board_id: int, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._local.get(board_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._local.move_to_end(board_id)
+            return entry[1]
+    def _put_local(self, board_id: int, version: int, payload: bytes) -> None:
+        with self._lock:
+            current = self._local.get(board_id)
+            if current is not None and current[0] > version:
+                return
+            self._local[board_id] = (version, payload)
+            self._local.move_to_end(board_id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+    async def get(self, board_id: int, version: int) -> Optional[bytes]:
+        payload = self._get_local(board_id, version)
+        if payload is not None:
+            return payload
+        try:
+            payload = await self.breaker.call(self.redis.get, self._key(board_id, version))
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            logger.warning(f"Board snapshot lookup failed for board {board_id}: {e}")
+            return None
+        if payload is not None:
+            self._put_local(board_id, version, payload)
+        return payload
+    async def put(self, board_id: int, version: int, payload: bytes) -> None:
+        self._put_local(board_id, version, payload)
+        try:
+            await self.breaker.call(self.redis.set, self._key(board_id, version), payload, ex=self.ttl_seconds)
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            logger.warning(f"Board snapshot store failed for board {board_id}: {e}")
+    def invalidate(self, board_id: int) -> None:
+        with self._lock:
+            self._local.pop(board_id, None)
+board_snapshot_cache = BoardSnapshotCache(
+    redis_client,
+    redis_breaker,
+    max_entries=settings.BOARD_SNAPSHOT_CACHE_SIZE,
+    ttl_seconds=settings.BOARD_SNAPSHOT_TTL_SECONDS
+)
\ No newline at end of file
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, update
+from config import settings
+from database import AsyncSessionLocal
+from models import Board, BoardChange
+logger = logging.getLogger(__name__)
+class BoardChangeRetention:
+    def __init__(self, retention_seconds: float, interval_seconds: float = 300, batch_size: int = 5000):
+        self.retention_seconds = retention_seconds
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+    async def prune_batch(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        expired_ids = (
+            select(BoardChange.id)
+            .where(BoardChange.created_at < cutoff)
+            .order_by(BoardChange.id)
+            .limit(self.batch_size)
+        )
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                pruned = (await session.execute(
+                    delete(BoardChange)
+                    .where(BoardChange.id.in_(expired_ids))
+                    .returning(BoardChange.board_id, BoardChange.version)
+                )).all()
+                watermarks: dict[int, int] = {}
+                for board_id, version in pruned:
+                    watermarks[board_id] = max(version, watermarks.get(board_id, 0))
+                for board_id in sorted(watermarks):
+                    await session.execute(
+                        update(Board)
+                        .where(Board.id == board_id)
+                        .values(changes_watermark=func.greatest(Board.changes_watermark, watermarks[board_id]))
+                    )
+        return len(pruned)
+    async def prune(self) -> int:
+        total = 0
+        while True:
+            pruned = await self.prune_batch()
+            total += pruned
+            if pruned < self.batch_size:
+                return total
+    async def run(self) -> None:
+        while True:
+            try:
+                pruned = await self.prune()
+                if pruned:
+                    logger.info(f"Pruned {pruned} board changes")
+            except Exception as e:
+                logger.error(f"Board change pruning failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+board_change_retention = BoardChangeRetention(
+    retention_seconds=settings.BOARD_CHANGES_RETENTION_HOURS * 3600,
+    interval_seconds=settings.BOARD_CHANGES_PRUNE_INTERVAL_SECONDS,
+    batch_size=settings.BOARD_CHANGES_PRUNE_BATCH_SIZE
+)
\ No newline at end of file
@@ -0,0 +1,53 @@
+import json
+import zlib
+from typing import Any, AsyncIterator
+from sqlalchemy import Select, select
+from config import settings
+from database import engine
+from models import Board, Card, CardHistory, Comment, Label, List
+from models.association_tables import cards_labels
+def _row_line(record_type: str, row: Any) -> str:
+    return json.dumps({"type": record_type, **row._asdict()}, default=str, separators=(",", ":")) + "\n"
+def _export_queries(board_id: int) -> list[tuple[str, Select]]:
+    card_ids = select(Card.id).join(List, Card.list_id == List.id).where(List.board_id == board_id)
+    card_columns = [column for column in Card.__table__.c if column.key != "search_vector"]
+    return [
+        ("list", select(List.__table__).where(List.board_id == board_id).order_by(List.position, List.id)),
+        ("label", select(Label.__table__).where(Label.board_id == board_id).order_by(Label.id)),
+        ("card", select(*card_columns).join(List, Card.list_id == List.id).where(List.board_id == board_id).order_by(Card.id)),
+        ("card_label", select(cards_labels).where(cards_labels.c.card_id.in_(card_ids))),
+        ("comment", select(Comment.__table__).where(Comment.card_id.in_(card_ids)).order_by(Comment.id)),
+        ("card_history", select(CardHistory.__table__).where(CardHistory.card_id.in_(card_ids)).order_by(CardHistory.id)),
+    ]
+async def _ndjson_chunks(board_id: int) -> AsyncIterator[bytes]:
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        async with connection.begin():
+            board = (await connection.execute(select(Board.__table__).where(Board.id == board_id))).one_or_none()
+            if board is None:
+                return
+            yield _row_line("board", board).encode()
+            buffer: list[str] = []
+            size = 0
+            for record_type, query in _export_queries(board_id):
+                result = await connection.stream(query.execution_options(yield_per=settings.EXPORT_YIELD_PER))
+                async for partition in result.partitions():
+                    for row in partition:
+                        line = _row_line(record_type, row)
+                        buffer.append(line)
+                        size += len(line)
+                    if size >= settings.EXPORT_CHUNK_BYTES:
+                        yield "".join(buffer).encode()
+                        buffer.clear()
+                        size = 0
+            if buffer:
+                yield "".join(buffer).encode()
+async def stream_board_export(board_id: int, compress: bool = False) -> AsyncIterator[bytes]:
+    if not compress:
+        async for chunk in _ndjson_chunks(board_id):
+            yield chunk
+        return
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in _ndjson_chunks(board_id):
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
\ No newline at end of file
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from database import AsyncSessionLocal, get_unit_of_work
+from models import User
+from repositories.board_repository import BoardRepository
+from schemas import BoardCreate
+from schemas.board import BoardImportSummary
+from services.notification_service import NotificationService
+from utils.exceptions import ImportValidationError
+from utils.ranking import spaced_ranks
+from utils.validators import validate_color_hex, validate_iso_format, validate_name_length
+TRELLO_COLORS = {
+    "green": "#61bd4f",
+    "yellow": "#f2d600",
+    "orange": "#ff9f1a",
+    "red": "#eb5a46",
+    "purple": "#c377e0",
+    "blue": "#0079bf",
+    "sky": "#00c2e0",
+    "lime": "#51e898",
+    "pink": "#ff78cb",
+    "black": "#344563"
+}
+DEFAULT_LABEL_COLOR = "#b3bac5"
+def _empty_dump() -> dict[str, Any]:
+    return {"board": None, "lists": [], "labels": [], "cards": [], "card_labels": []}
+def parse_ndjson(lines: Iterable[str]) -> dict[str, Any]:
+    dump = _empty_dump()
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ImportValidationError([f"line {line_number}: {e.msg}"])
+        record_type = record.get("type")
+        if record_type == "board":
+            dump["board"] = {"name": record.get("name"), "description": record.get("description")}
+        elif record_type == "list":
+            dump["lists"].append({"source_id": record.get("id"), "name": record.get("name"), "sort_key": record.get("position") or ""})
+        elif record_type == "label":
+            dump["labels"].append({"source_id": record.get("id"), "name": record.get("name"), "color": record.get("color")})
+        elif record_type == "card":
+            dump["cards"].append({
+                "source_id": record.get("id"),
+                "list_source_id": record.get("list_id"),
+                "title": record.get("title"),
+                "description": record.get("description"),
+                "due_date": record.get("due_date"),
+                "sort_key": record.get("position") or ""
+            })
+        elif record_type == "card_label":
+            dump["card_labels"].append((record.get("card_id"), record.get("label_id")))
+    return dump
+def parse_trello(document: dict[str, Any]) -> dict[str, Any]:
+    dump = _empty_dump()
+    dump["board"] = {"name": document.get("name"), "description": document.get("desc") or None}
+    open_lists = set()
+    for trello_list in document.get("lists", []):
+        if trello_list.get("closed"):
+            continue
+        open_lists.add(trello_list.get("id"))
+        dump["lists"].append({"source_id": trello_list.get("id"), "name": trello_list.get("name"), "sort_key": trello_list.get("pos") or 0})
+    for label in document.get("labels", []):
+        dump["labels"].append({
+            "source_id": label.get("id"),
+            "name": label.get("name") or label.get("color") or "label",
+            "color": TRELLO_COLORS.get(label.get("color"), DEFAULT_LABEL_COLOR)
+        })
+    for card in document.get("cards", []):
+        if card.get("closed") or card.get("idList") not in open_lists:
+            continue
+        dump["cards"].append({
+            "source_id": card.get("id"),
+            "list_source_id": card.get("idList"),
+            "title": card.get("name"),
+            "description": card.get("desc") or None,
+            "due_date": card.get("due"),
+            "sort_key": card.get("pos") or 0
+        })
+        for label_id in card.get("idLabels", []):
+            dump["card_labels"].append((card.get("id"), label_id))
+    return dump
+def _validate_list(row: dict[str, Any], context: dict[str, set]) -> Optional[str]:
+    if not validate_name_length(row["name"], min_length=1, max_length=255):
+        return "list name must be 1-255 characters"
+    return None
+def _validate_label(row: dict[str, Any], context: dict[str, set]) -> Optional[str]:
+    if not validate_name_length(row["name"], min_length=1, max_length=50):
+        return "label name must be 1-50 characters"
+    if not validate_color_hex(row["color"]):
+        return f"invalid label color {row['color']!r}"
+    return None
+def _validate_card(row: dict[str, Any], context: dict[str, set]) -> Optional[str]:
+    if not validate_name_length(row["title"], min_length=1, max_length=200):
+        return "card title must be 1-200 characters"
+    if row["list_source_id"] not in context["lists"]:
+        return f"unknown list {row['list_source_id']!r}"
+    if row["due_date"] is not None and not validate_iso_format(row["due_date"]):
+        return f"invalid due date {row['due_date']!r}"
+    return None
+def _validate_card_label(row: tuple[Any, Any], context: dict[str, set]) -> Optional[str]:
+    if row[0] not in context["cards"] or row[1] not in context["labels"]:
+        return f"unknown card or label in {row!r}"
+    return None
+def _duplicate_source_ids(kind: str, rows: list[dict[str, Any]], start: int, seen: set) -> list[str]:
+    errors = []
+    for offset, row in enumerate(rows):
+        if row["source_id"] in seen:
+            errors.append(f"{kind}[{start + offset}]: duplicate source id {row['source_id']!r}")
+        seen.add(row["source_id"])
+    return errors
+async def validate_dump(dump: dict[str, Any], batch_size: int = 1000, max_errors: int = 50) -> list[str]:
+    errors: list[str] = []
+    board = dump["board"]
+    if board is None:
+        return ["missing board record"]
+    if not validate_name_length(board["name"], min_length=1, max_length=100):
+        errors.append("board: name must be 1-100 characters")
+    context = {
+        "lists": {row["source_id"] for row in dump["lists"]},
+        "labels": {row["source_id"] for row in dump["labels"]},
+        "cards": {row["source_id"] for row in dump["cards"]}
+    }
+    for kind, validator in (
+        ("lists", _validate_list),
+        ("labels", _validate_label),
+        ("cards", _validate_card),
+        ("card_labels", _validate_card_label)
+    ):
+        rows = dump[kind]
+        seen: set = set()
+        for start in range(0, len(rows), batch_size):
+            if kind != "card_labels":
+                errors.extend(_duplicate_source_ids(kind, rows[start:start + batch_size], start, seen))
+            errors.extend(
+                f"{kind}[{start + offset}]: {error}"
+                for offset, error in enumerate(validator(row, context) for row in rows[start:start + batch_size])
+                if error is not None
+            )
+            if len(errors) >= max_errors:
+                return errors[:max_errors]
+            await asyncio.sleep(0)
+    return errors
+def _parse_due_date(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+async def _reserve_ids(connection, table: str, count: int) -> list[int]:
+    if not count:
+        return []
+    rows = await connection.fetch(
+        "SELECT nextval(pg_get_serial_sequence($1, 'id')) FROM generate_series(1, $2)",
+        table,
+        count
+    )
+    return [row[0] for row in rows]
+async def import_board(db: AsyncSession, dump: dict[str, Any], owner: User) -> BoardImportSummary:
+    errors = await validate_dump(
+        dump,
+        batch_size=settings.IMPORT_VALIDATION_BATCH_SIZE,
+        max_errors=settings.IMPORT_MAX_ERRORS
+    )
+    if errors:
+        raise ImportValidationError(errors)
+    board = await BoardRepository(db).create_with_owner(
+        BoardCreate(name=dump["board"]["name"], description=dump["board"]["description"]),
+        owner.id
+    )
+    raw_connection = await (await db.connection()).get_raw_connection()
+    connection = raw_connection.driver_connection
+    lists = sorted(dump["lists"], key=lambda row: row["sort_key"])
+    list_ids = dict(zip((row["source_id"] for row in lists), await _reserve_ids(connection, "lists", len(lists))))
+    await connection.copy_records_to_table(
+        "lists",
+        columns=["id", "name", "position", "version", "board_id", "created_at"],
+        records=[
+            (list_ids[row["source_id"]], row["name"], rank, 1, board.id, datetime.utcnow())
+            for row, rank in zip(lists, spaced_ranks(len(lists)))
+        ]
+    )
+    label_ids = dict(zip((row["source_id"] for row in dump["labels"]), await _reserve_ids(connection, "labels", len(dump["labels"]))))
+    await connection.copy_records_to_table(
+        "labels",
+        columns=["id", "name", "color", "board_id"],
+        records=[(label_ids[row["source_id"]], row["name"], row["color"], board.id) for row in dump["labels"]]
+    )
+    cards_by_list: dict[Any, list[dict[str, Any]]] = {}
+    for row in dump["cards"]:
+        cards_by_list.setdefault(row["list_source_id"], []).append(row)
+    card_ids = dict(zip((row["source_id"] for row in dump["cards"]), await _reserve_ids(connection, "cards", len(dump["cards"]))))
+    card_records = []
+    for list_source_id, rows in cards_by_list.items():
+        rows.sort(key=lambda row: row["sort_key"])
+        for row, rank in zip(rows, spaced_ranks(len(rows))):
+            card_records.append((
+                card_ids[row["source_id"]],
+                row["title"],
+                row["description"],
+                rank,
+                list_ids[list_source_id],
+                _parse_due_date(row["due_date"])
+            ))
+    await connection.copy_records_to_table(
+        "cards",
+        columns=["id", "title", "description", "position", "list_id", "due_date"],
+        records=card_records
+    )
+    card_label_records = list({(card_ids[card_id], label_ids[label_id]) for card_id, label_id in dump["card_labels"]})
+    await connection.copy_records_to_table(
+        "cards_labels",
+        columns=["card_id", "label_id"],
+        records=card_label_records
+    )
+    summary = BoardImportSummary(
+        board_id=board.id,
+        lists=len(list_ids),
+        labels=len(label_ids),
+        cards=len(card_records),
+        card_labels=len(card_label_records)
+    )
+    await NotificationService(db).notify_board_imported(board, owner, summary.model_dump(exclude={"board_id"}))
+    await get_unit_of_work(db).commit()
+    return summary
+def load_dump(data: bytes, source_format: str) -> dict[str, Any]:
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ImportValidationError(["dump must be UTF-8 encoded"])
+    if source_format == "trello":
+        try:
+            return parse_trello(json.loads(content))
+        except json.JSONDecodeError as e:
+            raise ImportValidationError([f"invalid Trello JSON: {e.msg}"])
+    return parse_ndjson(content.splitlines())
+async def _import_file(path: str, source_format: str, owner_id: int) -> BoardImportSummary:
+    with open(path, "rb") as dump_file:
+        dump = load_dump(dump_file.read(), source_format)
+    async with AsyncSessionLocal() as session:
+        owner = await session.get(User, owner_id)
+        if owner is None:
+            raise SystemExit(f"User {owner_id} not found")
+        return await import_board(session, dump, owner)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a board dump")
+    parser.add_argument("path")
+    parser.add_argument("--owner-id", type=int, required=True)
+    parser.add_argument("--format", choices=["ndjson", "trello"], default="ndjson")
+    args = parser.parse_args()
+    try:
+        result = asyncio.run(_import_file(args.path, args.format, args.owner_id))
+    except ImportValidationError as e:
+        raise SystemExit("\n".join(e.detail))
+    print(result.model_dump_json())
\ No newline at end of file
@@ -1,88 +1,191 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select
 import uuid
+from typing import Optional
 from datetime import datetime, timedelta
-from models import Board, BoardMember, User, BoardInvitation, BoardActivity
+from functools import partial
+from models import Board, BoardMember, User, BoardInvitation, List, Card, Label, Comment
 from schemas import BoardCreate, BoardUpdate, BoardMemberResponse, InvitationCreate, InvitationResponse
 from repositories.board_repository import BoardRepository
+from database import get_unit_of_work
 from repositories.user_repository import UserRepository
 from services.notification_service import NotificationService
-from utils.exceptions import NotFoundException, PermissionException
+from services.board_cache import board_snapshot_cache
+from services.acl_cache import BoardAcl, board_acl_cache
+from services.audit_writer import audit_writer
+from schemas import BoardResponse, BoardChangesResponse, Tombstone
+from utils.etag import board_etag, etag_matches
+from utils.exceptions import ChangesExpiredError, NotFoundException, PermissionException, PreconditionFailedError
 class BoardService:
     @staticmethod
-    def _check_permission(
-        db: Session, 
+    async def get_board_acl(db: AsyncSession, board: Board) -> BoardAcl:
+        acl = board_acl_cache.get(board.id, board.members_version)
+        if acl is None:
+            acl = BoardAcl(
+                owner_id=board.owner_id,
+                is_public=board.is_public,
+                roles=await BoardRepository(db).get_member_roles(board.id)
+            )
+            board_acl_cache.put(board.id, board.members_version, acl)
+        return acl
+    @staticmethod
+    async def _check_permission(
+        db: AsyncSession, 
         board_id: int, 
         user: User, 
         required_roles: list[str],
         allow_public: bool = False
     ) -> Board:
-        board = BoardRepository.get_board(db, board_id)
+        board = await BoardRepository.get_board(db, board_id)
         if not board:
             raise NotFoundException(f"Board avec l'id {board_id} non trouvé")
         if allow_public and board.is_public:
             return board
-        member = BoardRepository.get_member(db, board_id, user.id)
-        if not member:
+        role = (await BoardService.get_board_acl(db, board)).role_of(user.id)
+        if role is None:
             raise PermissionException("Vous n'avez pas accès à ce board")
-        if member.role not in required_roles:
-            raise PermissionException(f"Rôle '{member.role}' insuffisant. Requis: {required_roles}")
+        if role not in required_roles:
+            raise PermissionException(f"Rôle '{role}' insuffisant. Requis: {required_roles}")
         return board
     @staticmethod
-    def get_board(db: Session, board_id: int, user: User) -> Board:
-        return BoardService._check_permission(
+    async def get_board_stamp(db: AsyncSession, board_id: int, user: User):
+        stamp = await BoardRepository(db).get_version_stamp(board_id)
+        if stamp is None:
+            raise NotFoundException(f"Board avec l'id {board_id} non trouvé")
+        if not stamp.is_public and (await BoardService.get_board_acl(db, stamp)).role_of(user.id) is None:
+            raise PermissionException("Vous n'avez pas accès à ce board")
+        return stamp
+    @staticmethod
+    async def check_precondition(db: AsyncSession, board_id: int, if_match: Optional[str], resource: str = "board") -> None:
+        if if_match is None:
+            return
+        stamp = await BoardRepository(db).get_version_stamp(board_id, for_update=True)
+        if stamp is None:
+            raise NotFoundException(f"Board avec l'id {board_id} non trouvé")
+        if not etag_matches(if_match, board_etag(stamp, resource), weak=False):
+            raise PreconditionFailedError()
+    @staticmethod
+    async def get_board(db: AsyncSession, board_id: int, user: User) -> Board:
+        return await BoardService._check_permission(
             db, board_id, user, 
             required_roles=["viewer", "member", "admin"],
             allow_public=True
         )
     @staticmethod
-    def get_user_boards(
-        db: Session, 
+    async def get_board_snapshot(db: AsyncSession, board_id: int, user: User) -> bytes:
+        board = await BoardService.get_board(db, board_id, user)
+        snapshot = await board_snapshot_cache.get(board.id, board.version)
+        if snapshot is None:
+            full_board = await BoardRepository(db).get_with_relations(board.id)
+            snapshot = BoardResponse.model_validate(full_board).model_dump_json().encode()
+            await board_snapshot_cache.put(board.id, board.version, snapshot)
+        return snapshot
+    @staticmethod
+    async def get_changes_since(db: AsyncSession, board_id: int, user: User, since: int) -> BoardChangesResponse:
+        board = await BoardService.get_board(db, board_id, user)
+        if since < board.changes_watermark:
+            raise ChangesExpiredError()
+        if since >= board.version:
+            return BoardChangesResponse(version=board.version)
+        version = board.version
+        latest: dict[tuple[str, int], str] = {}
+        for change in await BoardRepository(db).get_changes_since(board_id, since):
+            latest[(change.entity_type, change.entity_id)] = change.operation
+            version = max(version, change.version)
+        upserts: dict[str, set[int]] = {}
+        deleted = []
+        for (entity_type, entity_id), operation in latest.items():
+            if operation == "delete":
+                deleted.append(Tombstone(entity_type=entity_type, entity_id=entity_id))
+            else:
+                upserts.setdefault(entity_type, set()).add(entity_id)
+        lists = (await db.execute(select(List).where(
+            List.id.in_(upserts.get("list", set())),
+            List.board_id == board_id
+        ))).scalars().all() if "list" in upserts else []
+        cards = (await db.execute(select(Card).join(Card.list).options(
+            selectinload(Card.labels),
+            selectinload(Card.comments).joinedload(Comment.user),
+            joinedload(Card.assigned_user)
+        ).where(
+            Card.id.in_(upserts.get("card", set())),
+            List.board_id == board_id
+        ))).scalars().all() if "card" in upserts else []
+        labels = (await db.execute(select(Label).where(
+            Label.id.in_(upserts.get("label", set())),
+            Label.board_id == board_id
+        ))).scalars().all() if "label" in upserts else []
+        for entity_type, found in (("list", lists), ("card", cards), ("label", labels)):
+            for entity_id in upserts.get(entity_type, set()) - {entity.id for entity in found}:
+                deleted.append(Tombstone(entity_type=entity_type, entity_id=entity_id))
+        return BoardChangesResponse(
+            version=version,
+            board=board if "board" in upserts else None,
+            lists=lists,
+            cards=cards,
+            labels=labels,
+            member_ids=sorted(upserts.get("member", set())),
+            deleted=deleted
+        )
+    @staticmethod
+    async def get_user_boards(
+        db: AsyncSession, 
         user: User, 
         skip: int = 0, 
         limit: int = 100,
         include_public: bool = True
     ) -> list[Board]:
-        return BoardRepository.get_boards_by_user(
+        return await BoardRepository.get_boards_by_user(
             db, user.id, skip=skip, limit=limit, include_public=include_public
         )
     @staticmethod
-    def create_board(db: Session, board_data: BoardCreate, owner: User) -> Board:
-        board = BoardRepository.create_board(db, board_data, owner.id)
-        BoardRepository.add_member(db, board.id, owner.id, "admin")
+    async def create_board(db: AsyncSession, board_data: BoardCreate, owner: User) -> Board:
+        board = await BoardRepository.create_board(db, board_data, owner.id)
+        await BoardRepository(db).add_member(board.id, owner.id, "admin")
         BoardService._log_activity(db, board.id, owner.id, "board_created", {"board_name": board.name})
+        await get_unit_of_work(db).commit()
         return board
     @staticmethod
-    def update_board(
-        db: Session, 
+    async def update_board(
+        db: AsyncSession, 
         board_id: int, 
         board_data: BoardUpdate, 
-        user: User
+        user: User,
+        if_match: Optional[str] = None
     ) -> Board:
-        BoardService._check_permission(db, board_id, user, required_roles=["admin"])
-        updated_board = BoardRepository.update_board(db, board_id, board_data)
+        await BoardService._check_permission(db, board_id, user, required_roles=["admin"])
+        await BoardService.check_precondition(db, board_id, if_match)
+        updated_board = await BoardRepository.update_board(db, board_id, board_data)
+        await BoardRepository(db).record_change(board_id, "board", board_id)
         BoardService._log_activity(
             db, board_id, user.id, "board_updated", 
             {"updated_fields": board_data.model_dump(exclude_unset=True)}
         )
+        await get_unit_of_work(db).commit()
         return updated_board
     @staticmethod
-    def delete_board(db: Session, board_id: int, user: User) -> None:
-        board = BoardService._check_permission(db, board_id, user, required_roles=["admin"])
+    async def delete_board(db: AsyncSession, board_id: int, user: User, if_match: Optional[str] = None) -> None:
+        board = await BoardService._check_permission(db, board_id, user, required_roles=["admin"])
         if board.owner_id != user.id:
             raise PermissionException("Seul le propriétaire peut supprimer le board")
+        await BoardService.check_precondition(db, board_id, if_match)
         BoardService._log_activity(db, board_id, user.id, "board_deleted", {"board_name": board.name})
-        BoardRepository.delete_board(db, board_id)
+        await BoardRepository.delete_board(db, board_id)
+        uow = get_unit_of_work(db)
+        uow.after_commit(partial(board_snapshot_cache.invalidate, board_id))
+        await uow.commit()
     @staticmethod
-    def add_member(
-        db: Session, 
+    async def add_member(
+        db: AsyncSession, 
         board_id: int, 
         invitation_data: InvitationCreate, 
         current_user: User
     ) -> InvitationResponse:
-        BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
-        invited_user = UserRepository.get_by_email(db, invitation_data.email)
+        await BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
+        invited_user = await UserRepository.get_by_email(db, invitation_data.email)
         if invited_user:
-            existing_member = BoardRepository.get_member(db, board_id, invited_user.id)
+            existing_member = await BoardRepository(db).get_member(board_id, invited_user.id)
             if existing_member:
                 raise PermissionException("Cet utilisateur est déjà membre du board")
         invitation = BoardInvitation(
@@ -94,59 +197,65 @@ class BoardService:
             expires_at=datetime.utcnow() + timedelta(days=7)
         )
         db.add(invitation)
-        db.commit()
-        db.refresh(invitation)
-        NotificationService.send_board_invitation(
-            invitation_data.email, 
-            current_user.username, 
-            board_id,
-            invitation.token
-        )
         BoardService._log_activity(
             db, board_id, current_user.id, "member_invited", 
             {"invited_email": invitation_data.email, "role": invitation_data.role}
         )
+        uow = get_unit_of_work(db)
+        uow.after_commit(partial(
+            NotificationService.send_board_invitation,
+            invitation_data.email, 
+            current_user.username, 
+            board_id,
+            invitation.token
+        ))
+        await uow.commit()
+        await db.refresh(invitation)
         return invitation
     @staticmethod
-    def remove_member(db: Session, board_id: int, user_id: int, current_user: User) -> None:
-        board = BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
+    async def remove_member(db: AsyncSession, board_id: int, user_id: int, current_user: User) -> None:
+        board = await BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
         if current_user.id == user_id:
-            admin_count = BoardRepository.get_admin_count(db, board_id)
+            admin_count = await BoardRepository(db).get_admin_count(board_id)
             if admin_count <= 1:
                 raise PermissionException("Impossible de se supprimer : vous êtes le seul administrateur")
         if board.owner_id == user_id:
             raise PermissionException("Impossible de supprimer le propriétaire du board")
-        member = BoardRepository.get_member(db, board_id, user_id)
+        member = await BoardRepository(db).get_member(board_id, user_id)
         if not member:
             raise NotFoundException("Membre non trouvé")
-        BoardRepository.remove_member(db, board_id, user_id)
+        await BoardRepository(db).remove_member(board_id, user_id)
+        await BoardRepository(db).record_change(board_id, "member", user_id, "delete")
         BoardService._log_activity(
             db, board_id, current_user.id, "member_removed", 
             {"removed_user_id": user_id}
         )
+        await get_unit_of_work(db).commit()
     @staticmethod
-    def update_member_role(
-        db: Session, 
+    async def update_member_role(
+        db: AsyncSession, 
         board_id: int, 
         user_id: int, 
         new_role: str, 
         current_user: User
     ) -> BoardMember:
-        board = BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
+        board = await BoardService._check_permission(db, board_id, current_user, required_roles=["admin"])
         if board.owner_id == user_id:
             raise PermissionException("Impossible de modifier le rôle du propriétaire")
-        member = BoardRepository.get_member(db, board_id, user_id)
+        member = await BoardRepository(db).get_member(board_id, user_id)
         if not member:
             raise NotFoundException("Membre non trouvé")
-        updated_member = BoardRepository.update_member_role(db, board_id, user_id, new_role)
+        updated_member = await BoardRepository(db).update_member_role(board_id, user_id, new_role)
+        await BoardRepository(db).record_change(board_id, "member", user_id)
         BoardService._log_activity(
             db, board_id, current_user.id, "member_role_updated", 
             {"user_id": user_id, "new_role": new_role}
         )
+        await get_unit_of_work(db).commit()
         return updated_member
     @staticmethod
-    def accept_invitation(db: Session, token: str, user: User) -> Board:
-        invitation = BoardRepository.get_invitation_by_token(db, token)
+    async def accept_invitation(db: AsyncSession, token: str, user: User) -> Board:
+        invitation = await BoardRepository.get_invitation_by_token(db, token)
         if not invitation:
             raise NotFoundException("Invitation invalide")
         if invitation.email != user.email:
@@ -155,55 +264,50 @@ class BoardService:
             raise PermissionException("Invitation expirée")
         if invitation.used or invitation.declined:
             raise PermissionException("Invitation déjà utilisée ou déclinée")
-        existing_member = BoardRepository.get_member(db, invitation.board_id, user.id)
+        existing_member = await BoardRepository(db).get_member(invitation.board_id, user.id)
         if existing_member:
             raise PermissionException("Vous êtes déjà membre de ce board")
         board_id = invitation.board_id
-        BoardRepository.add_member(db, board_id, user.id, invitation.role)
+        await BoardRepository(db).add_member(board_id, user.id, invitation.role)
         invitation.used = True
         invitation.used_at = datetime.utcnow()
-        db.commit()
+        await BoardRepository(db).record_change(board_id, "member", user.id)
         BoardService._log_activity(
             db, board_id, user.id, "invitation_accepted", 
             {"role": invitation.role}
         )
-        return BoardRepository.get_board(db, board_id)
+        await get_unit_of_work(db).commit()
+        return await BoardRepository.get_board(db, board_id)
     @staticmethod
-    def decline_invitation(db: Session, token: str, user: User) -> None:
-        invitation = BoardRepository.get_invitation_by_token(db, token)
+    async def decline_invitation(db: AsyncSession, token: str, user: User) -> None:
+        invitation = await BoardRepository.get_invitation_by_token(db, token)
         if not invitation:
             raise NotFoundException("Invitation invalide")
         if invitation.email != user.email:
             raise PermissionException("Cette invitation n'est pas destinée à cette adresse email")
         invitation.declined = True
         invitation.declined_at = datetime.utcnow()
-        db.commit()
         BoardService._log_activity(
             db, invitation.board_id, user.id, "invitation_declined", 
             {}
         )
+        await get_unit_of_work(db).commit()
     @staticmethod
-    def get_board_members(db: Session, board_id: int, user: User) -> list[BoardMemberResponse]:
-        BoardService._check_permission(
+    async def get_board_members(db: AsyncSession, board_id: int, user: User) -> list[BoardMemberResponse]:
+        await BoardService._check_permission(
             db, board_id, user, 
             required_roles=["viewer", "member", "admin"],
             allow_public=True
         )
-        return BoardRepository.get_members_with_details(db, board_id)
+        return await BoardRepository.get_members_with_details(db, board_id)
     @staticmethod
     def _log_activity(
-        db: Session, 
+        db: AsyncSession, 
         board_id: int, 
         user_id: int, 
         action: str, 
         details: dict
     ) -> None:
-        activity = BoardActivity(
-            board_id=board_id,
-            user_id=user_id,
-            action=action,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        db.add(activity)
-        db.commit()
\ No newline at end of file
+        get_unit_of_work(db).after_commit(
+            partial(audit_writer.record_board_activity, board_id, user_id, action, details)
+        )
\ No newline at end of file
@@ -1,44 +1,64 @@
 from typing import Optional
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from functools import partial
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, select
 from models import Card, CardHistory, Comment, Label, List, Board, User, BoardMember
 from schemas import CardCreate, CardUpdate, CardMove
 from services.notification_service import NotificationService
+from repositories.base import paginate
 from repositories.board_repository import BoardRepository
+from database import get_unit_of_work
+from services.rank_rebalancer import rank_rebalancer
+from services.audit_writer import audit_writer
+from services.board_service import BoardService
 from utils.exceptions import PermissionError, NotFoundError, ValidationError
+from utils.ranking import rank_between, needs_rebalance
 class CardService:
-    def __init__(self, db: Session, notification_service: NotificationService):
+    def __init__(self, db: AsyncSession, notification_service: NotificationService):
         self.db = db
         self.notification_service = notification_service
         self.board_repository = BoardRepository(db)
-    def _check_board_permission(self, board_id: int, user_id: int, require_admin: bool = False) -> Board:
-        board = self.db.query(Board).filter(Board.id == board_id).first()
+        self.uow = get_unit_of_work(db)
+    async def _check_board_permission(self, board_id: int, user_id: int, require_admin: bool = False) -> Board:
+        board = await self.db.get(Board, board_id)
         if not board:
             raise NotFoundError("Board not found")
-        if not self.board_repository.has_permission(board_id, user_id, require_admin):
+        role = (await BoardService.get_board_acl(self.db, board)).role_of(user_id)
+        if role is None or (require_admin and role != "admin"):
             raise PermissionError("Access denied to this board")
         return board
-    def _get_card_with_permissions(self, card_id: int, user_id: int) -> Card:
-        card = self.db.query(Card).options(
+    def _record_history(self, card_id: int, user_id: int, action: str, details: dict) -> None:
+        self.uow.after_commit(partial(audit_writer.record_card_history, card_id, user_id, action, details))
+    async def _load_card(self, card_id: int) -> Optional[Card]:
+        query = select(Card).options(
             joinedload(Card.list).joinedload(List.board),
-            joinedload(Card.labels),
-            joinedload(Card.assignees),
-            joinedload(Card.comments)
-        ).filter(Card.id == card_id).first()
+            selectinload(Card.labels),
+            selectinload(Card.assignees),
+            selectinload(Card.comments)
+        ).where(Card.id == card_id).execution_options(populate_existing=True)
+        return (await self.db.execute(query)).scalar_one_or_none()
+    async def _get_card_with_permissions(self, card_id: int, user_id: int) -> Card:
+        card = await self._load_card(card_id)
         if not card:
             raise NotFoundError("Card not found")
-        self._check_board_permission(card.list.board_id, user_id)
+        await self._check_board_permission(card.list.board_id, user_id)
         return card
-    def create_card(self, card_data: CardCreate, user_id: int) -> Card:
-        board_list = self.db.query(List).filter(List.id == card_data.list_id).first()
+    async def create_card(self, card_data: CardCreate, user_id: int) -> Card:
+        board_list = await self.db.get(List, card_data.list_id)
         if not board_list:
             raise NotFoundError("List not found")
-        self._check_board_permission(board_list.board_id, user_id)
-        max_position = self.db.query(Card).filter(
-            Card.list_id == card_data.list_id
-        ).order_by(Card.position.desc()).first()
-        position = (max_position.position + 1) if max_position else 0
+        await self._check_board_permission(board_list.board_id, user_id)
+        if card_data.position is not None:
+            position = await self._rank_at(card_data.list_id, card_data.position)
+        else:
+            max_position = (await self.db.execute(
+                select(Card.position).where(Card.list_id == card_data.list_id).order_by(Card.position.desc()).limit(1)
+            )).scalar_one_or_none()
+            position = rank_between(max_position, None)
+        if needs_rebalance(position):
+            rank_rebalancer.schedule(card_data.list_id)
         card = Card(
             title=card_data.title,
             description=card_data.description,
@@ -48,27 +68,21 @@ class CardService:
             created_by_id=user_id
         )
         self.db.add(card)
-        self.db.commit()
-        self.db.refresh(card)
-        self.notification_service.create_card_notification(
+        await self.db.flush()
+        await self.board_repository.record_change(board_list.board_id, "card", card.id)
+        self._record_history(card.id, user_id, "created", {"title": card.title, "list_id": card.list_id})
+        await self.notification_service.create_card_notification(
             board_list.board_id,
             user_id,
             card.id,
             card.title
         )
-        history_entry = CardHistory(
-            card_id=card.id,
-            user_id=user_id,
-            action="created",
-            details={"title": card.title, "list_id": card.list_id}
-        )
-        self.db.add(history_entry)
-        self.db.commit()
-        return card
-    def get_card(self, card_id: int, user_id: int) -> Card:
-        return self._get_card_with_permissions(card_id, user_id)
-    def update_card(self, card_id: int, card_data: CardUpdate, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
+        await self.uow.commit()
+        return await self._load_card(card.id)
+    async def get_card(self, card_id: int, user_id: int) -> Card:
+        return await self._get_card_with_permissions(card_id, user_id)
+    async def update_card(self, card_id: int, card_data: CardUpdate, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
         changes = {}
         for field, value in card_data.dict(exclude_unset=True).items():
             old_value = getattr(card, field)
@@ -76,103 +90,106 @@ class CardService:
                 changes[field] = {"old": old_value, "new": value}
                 setattr(card, field, value)
         card.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(card)
+        await self.board_repository.record_change(card.list.board_id, "card", card.id)
         if changes:
-            self.notification_service.update_card_notification(
+            self._record_history(card.id, user_id, "updated", changes)
+            await self.notification_service.update_card_notification(
                 card.list.board_id,
                 user_id,
                 card.id,
                 card.title,
                 changes
             )
-            history_entry = CardHistory(
-                card_id=card.id,
-                user_id=user_id,
-                action="updated",
-                details=changes
-            )
-            self.db.add(history_entry)
-            self.db.commit()
-        return card
-    def delete_card(self, card_id: int, user_id: int) -> None:
-        card = self._get_card_with_permissions(card_id, user_id)
+        await self.uow.commit()
+        return await self._load_card(card.id)
+    async def delete_card(self, card_id: int, user_id: int) -> None:
+        card = await self._get_card_with_permissions(card_id, user_id)
         board_id = card.list.board_id
-        card_title = card.title
-        self.db.delete(card)
-        self.db.commit()
-        self.notification_service.delete_card_notification(
+        await self.db.delete(card)
+        await self.board_repository.record_change(board_id, "card", card_id, "delete")
+        await self.notification_service.delete_card_notification(
             board_id,
             user_id,
-            card_title
+            card.title
         )
-    def move_card(self, card_id: int, move_data: CardMove, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
-        new_list = self.db.query(List).filter(List.id == move_data.new_list_id).first()
+        await self.uow.commit()
+    async def move_card(self, card_id: int, move_data: CardMove, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
+        new_list = await self.db.get(List, move_data.new_list_id)
         if not new_list:
             raise NotFoundError("Target list not found")
         if card.list.board_id != new_list.board_id:
-            self._check_board_permission(new_list.board_id, user_id)
+            await self._check_board_permission(new_list.board_id, user_id)
         old_list_id = card.list_id
+        old_board_id = card.list.board_id
         old_position = card.position
+        new_rank = await self._rank_at(move_data.new_list_id, move_data.new_position, exclude_card_id=card_id)
         card.list_id = move_data.new_list_id
-        card.position = move_data.new_position
-        self._reorder_cards(old_list_id, exclude_card_id=card_id)
-        self._reorder_cards(move_data.new_list_id, exclude_card_id=card_id)
+        card.position = new_rank
+        if needs_rebalance(new_rank):
+            rank_rebalancer.schedule(move_data.new_list_id)
         card.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(card)
-        self.notification_service.move_card_notification(
-            card.list.board_id,
+        await self.board_repository.record_change(new_list.board_id, "card", card.id)
+        if old_board_id != new_list.board_id:
+            await self.board_repository.record_change(old_board_id, "card", card.id, "delete")
+        self._record_history(card.id, user_id, "moved", {
+            "old_list_id": old_list_id,
+            "new_list_id": move_data.new_list_id,
+            "old_position": old_position,
+            "new_position": new_rank
+        })
+        await self.notification_service.move_card_notification(
+            new_list.board_id,
             user_id,
             card.id,
             card.title,
             old_list_id,
             move_data.new_list_id
         )
-        history_entry = CardHistory(
-            card_id=card.id,
-            user_id=user_id,
-            action="moved",
-            details={
-                "old_list_id": old_list_id,
-                "new_list_id": move_data.new_list_id,
-                "old_position": old_position,
-                "new_position": move_data.new_position
-            }
-        )
-        self.db.add(history_entry)
-        self.db.commit()
-        return card
-    def _reorder_cards(self, list_id: int, exclude_card_id: Optional[int] = None) -> None:
-        cards = self.db.query(Card).filter(
-            Card.list_id == list_id
-        ).order_by(Card.position).all()
-        for index, card in enumerate(cards):
-            if card.id != exclude_card_id:
-                card.position = index
-        self.db.commit()
-    def add_comment(self, card_id: int, content: str, user_id: int) -> Comment:
-        card = self._get_card_with_permissions(card_id, user_id)
+        await self.uow.commit()
+        return await self._load_card(card.id)
+    async def _rank_at(self, list_id: int, index: int, exclude_card_id: Optional[int] = None) -> str:
+        query = select(Card.position).where(Card.list_id == list_id)
+        if exclude_card_id is not None:
+            query = query.where(Card.id != exclude_card_id)
+        neighbours = (await self.db.execute(
+            query.order_by(Card.position, Card.id).offset(max(index - 1, 0)).limit(2)
+        )).scalars().all()
+        if index <= 0:
+            return rank_between(None, neighbours[0] if neighbours else None)
+        if not neighbours:
+            last = (await self.db.execute(
+                query.order_by(Card.position.desc(), Card.id.desc()).limit(1)
+            )).scalar_one_or_none()
+            return rank_between(last, None)
+        before = neighbours[0]
+        after = neighbours[1] if len(neighbours) > 1 else None
+        if after is not None and after <= before:
+            rank_rebalancer.schedule(list_id)
+            raise ValidationError("List ordering is being rebalanced, retry the move")
+        return rank_between(before, after)
+    async def add_comment(self, card_id: int, content: str, user_id: int) -> Comment:
+        card = await self._get_card_with_permissions(card_id, user_id)
         comment = Comment(
             content=content,
             card_id=card_id,
             user_id=user_id
         )
         self.db.add(comment)
-        self.db.commit()
-        self.db.refresh(comment)
-        self.notification_service.comment_notification(
+        await self.board_repository.record_change(card.list.board_id, "card", card.id)
+        await self.notification_service.comment_notification(
             card.list.board_id,
             user_id,
             card_id,
             card.title,
-            comment.content
+            content
         )
+        await self.uow.commit()
+        await self.db.refresh(comment)
         return comment
-    def add_label_to_card(self, card_id: int, label_id: int, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
-        label = self.db.query(Label).filter(Label.id == label_id).first()
+    async def add_label_to_card(self, card_id: int, label_id: int, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
+        label = await self.db.get(Label, label_id)
         if not label:
             raise NotFoundError("Label not found")
         if label.board_id != card.list.board_id:
@@ -180,92 +197,112 @@ class CardService:
         if label not in card.labels:
             card.labels.append(label)
             card.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(card)
-            history_entry = CardHistory(
-                card_id=card.id,
-                user_id=user_id,
-                action="label_added",
-                details={"label_id": label_id, "label_name": label.name, "label_color": label.color}
-            )
-            self.db.add(history_entry)
-            self.db.commit()
+            await self.board_repository.record_change(card.list.board_id, "card", card.id)
+            self._record_history(card.id, user_id, "label_added", {"label_id": label_id, "label_name": label.name, "label_color": label.color})
+            await self.uow.commit()
+            card = await self._load_card(card.id)
         return card
-    def remove_label_from_card(self, card_id: int, label_id: int, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
-        label = self.db.query(Label).filter(Label.id == label_id).first()
+    async def remove_label_from_card(self, card_id: int, label_id: int, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
+        label = await self.db.get(Label, label_id)
         if not label:
             raise NotFoundError("Label not found")
         if label in card.labels:
             card.labels.remove(label)
             card.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(card)
-            history_entry = CardHistory(
-                card_id=card.id,
-                user_id=user_id,
-                action="label_removed",
-                details={"label_id": label_id, "label_name": label.name}
-            )
-            self.db.add(history_entry)
-            self.db.commit()
+            await self.board_repository.record_change(card.list.board_id, "card", card.id)
+            self._record_history(card.id, user_id, "label_removed", {"label_id": label_id, "label_name": label.name})
+            await self.uow.commit()
+            card = await self._load_card(card.id)
         return card
-    def assign_user_to_card(self, card_id: int, assignee_id: int, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
-        assignee = self.db.query(User).filter(User.id == assignee_id).first()
+    async def assign_user_to_card(self, card_id: int, assignee_id: int, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
+        assignee = await self.db.get(User, assignee_id)
         if not assignee:
             raise NotFoundError("User not found")
-        board_member = self.db.query(BoardMember).filter(
+        board_member = (await self.db.execute(select(BoardMember).where(
             and_(
                 BoardMember.board_id == card.list.board_id,
                 BoardMember.user_id == assignee_id
             )
-        ).first()
+        ))).scalar_one_or_none()
         if not board_member:
             raise ValidationError("User is not a member of this board")
         if assignee not in card.assignees:
             card.assignees.append(assignee)
             card.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(card)
-            self.notification_service.assignment_notification(
+            await self.board_repository.record_change(card.list.board_id, "card", card.id)
+            self._record_history(card.id, user_id, "user_assigned", {"assignee_id": assignee_id, "assignee_email": assignee.email})
+            await self.notification_service.assignment_notification(
                 card.list.board_id,
                 user_id,
                 assignee_id,
                 card.id,
                 card.title
             )
-            history_entry = CardHistory(
-                card_id=card.id,
-                user_id=user_id,
-                action="user_assigned",
-                details={"assignee_id": assignee_id, "assignee_email": assignee.email}
-            )
-            self.db.add(history_entry)
-            self.db.commit()
+            await self.uow.commit()
+            card = await self._load_card(card.id)
         return card
-    def remove_user_from_card(self, card_id: int, assignee_id: int, user_id: int) -> Card:
-        card = self._get_card_with_permissions(card_id, user_id)
-        assignee = self.db.query(User).filter(User.id == assignee_id).first()
+    async def remove_user_from_card(self, card_id: int, assignee_id: int, user_id: int) -> Card:
+        card = await self._get_card_with_permissions(card_id, user_id)
+        assignee = await self.db.get(User, assignee_id)
         if not assignee:
             raise NotFoundError("User not found")
         if assignee in card.assignees:
             card.assignees.remove(assignee)
             card.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(card)
-            history_entry = CardHistory(
-                card_id=card.id,
-                user_id=user_id,
-                action="user_unassigned",
-                details={"assignee_id": assignee_id, "assignee_email": assignee.email}
-            )
-            self.db.add(history_entry)
-            self.db.commit()
+            await self.board_repository.record_change(card.list.board_id, "card", card.id)
+            self._record_history(card.id, user_id, "user_unassigned", {"assignee_id": assignee_id, "assignee_email": assignee.email})
+            await self.uow.commit()
+            card = await self._load_card(card.id)
         return card
-    def get_card_history(self, card_id: int, user_id: int) -> list[CardHistory]:
-        card = self._get_card_with_permissions(card_id, user_id)
-        history = self.db.query(CardHistory).filter(
-            CardHistory.card_id == card_id
-        ).order_by(CardHistory.timestamp.desc()).all()
-        return history
\ No newline at end of file
+    async def get_cards_by_list(self, list_id: int, user_id: int) -> list[Card]:
+        board_list = await self.db.get(List, list_id)
+        if not board_list:
+            raise NotFoundError("List not found")
+        await self._check_board_permission(board_list.board_id, user_id)
+        query = select(Card).options(
+            selectinload(Card.labels),
+            selectinload(Card.assignees),
+            selectinload(Card.comments)
+        ).where(Card.list_id == list_id).order_by(Card.position)
+        return (await self.db.execute(query)).scalars().all()
+    async def get_user_assigned_cards(self, user_id: int) -> list[Card]:
+        query = select(Card).options(
+            selectinload(Card.labels),
+            selectinload(Card.assignees),
+            selectinload(Card.comments)
+        ).where(Card.assignees.any(User.id == user_id)).order_by(Card.due_date, Card.id)
+        return (await self.db.execute(query)).scalars().all()
+    async def get_cards_by_board(
+        self,
+        board_id: int,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[list[Card], Optional[str]]:
+        await self._check_board_permission(board_id, user_id)
+        query = select(Card).join(List, Card.list_id == List.id).options(
+            selectinload(Card.labels),
+            selectinload(Card.assignees),
+            selectinload(Card.comments)
+        ).where(List.board_id == board_id)
+        return await paginate(self.db, query, Card.created_at, Card.id, limit=limit, cursor=cursor)
+    async def get_card_history(
+        self,
+        card_id: int,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[list[CardHistory], Optional[str]]:
+        await self._get_card_with_permissions(card_id, user_id)
+        query = select(CardHistory).where(CardHistory.card_id == card_id)
+        return await paginate(
+            self.db,
+            query,
+            CardHistory.timestamp,
+            CardHistory.id,
+            limit=limit,
+            cursor=cursor,
+            descending=True
+        )
\ No newline at end of file
@@ -1,15 +1,21 @@
 import logging
-import json
+import orjson
 from datetime import datetime
+from functools import partial
 from typing import Any
-from redis.asyncio import Redis
-from models import User, Board, Card, Comment, Label
-from schemas import WebSocketMessage, NotificationType, NotificationData
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, Board, Card, Comment, Label, OutboxEvent
+from schemas import NotificationType, NotificationData
 from config import settings
+from database import get_unit_of_work
+from repositories.board_repository import BoardRepository
+from services.outbox_relay import outbox_relay
 logger = logging.getLogger(__name__)
 class NotificationService:
-    def __init__(self, redis_client: Redis):
-        self.redis = redis_client
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._pending: list[dict[str, Any]] = []
     def _create_notification(
         self,
         notification_type: NotificationType,
@@ -33,9 +39,24 @@ class NotificationService:
             timestamp=datetime.utcnow()
         )
     async def _publish(self, board_id: int, notification: NotificationData):
-        channel = f"board:{board_id}:notifications"
-        message = WebSocketMessage(type="notification", data=notification.dict())
-        await self.redis.publish(channel, message.json())
+        if not self._pending:
+            get_unit_of_work(self.db).before_commit(self.flush)
+        self._pending.append({
+            "board_id": board_id,
+            "payload": orjson.dumps({"type": "notification", "data": notification.model_dump()}).decode(),
+            "created_at": datetime.utcnow()
+        })
+    async def flush(self) -> int:
+        rows, self._pending = self._pending, []
+        if rows:
+            await BoardRepository.assign_versions(self.db)
+            await BoardRepository.lock_boards(self.db, {row["board_id"] for row in rows})
+            await self.db.execute(insert(OutboxEvent), rows)
+            outbox_relay.record_enqueued(len(rows))
+            uow = get_unit_of_work(self.db)
+            uow.after_commit(partial(outbox_relay.buffer_local, [(row["board_id"], row["payload"]) for row in rows]))
+            uow.after_commit(outbox_relay.wake)
+        return len(rows)
     async def notify_card_created(self, card: Card, creator: User):
         notification = self._create_notification(
             NotificationType.CARD_CREATED,
@@ -135,4 +156,16 @@ class NotificationService:
             board.id,
             {"changes": changes}
         )
+        await self._publish(board.id, notification)
+    async def notify_board_imported(self, board: Board, importer: User, counts: dict[str, int]):
+        notification = self._create_notification(
+            NotificationType.BOARD_UPDATED,
+            f"Board importé : {board.name}",
+            f"{importer.username} a importé {counts['cards']} cartes dans le board",
+            board.id,
+            "board",
+            importer.id,
+            board.id,
+            {"imported": counts}
+        )
         await self._publish(board.id, notification)
\ No newline at end of file
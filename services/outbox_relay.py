@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+from redis.asyncio import Redis
+from sqlalchemy import delete, func, select, update
+from config import settings
+from database import AsyncSessionLocal
+from models import OutboxEvent
+from utils.circuit_breaker import CircuitBreaker
+from utils.redis_client import redis_client, redis_breaker
+logger = logging.getLogger(__name__)
+PUBLISH_WITH_SEQ_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], '{"seq":' .. seq .. ',' .. string.sub(ARGV[2], 2))
+return seq
+"""
+OUTBOX_RELAY_LOCK_KEY = 7_301_822_745
+def board_sequence_key(board_id: int) -> str:
+    return f"board:{board_id}:seq"
+def board_channel(board_id: int) -> str:
+    return f"board:{board_id}:notifications"
+class OutboxRelay:
+    def __init__(
+        self,
+        redis: Redis,
+        breaker: CircuitBreaker,
+        batch_size: int = 200,
+        poll_interval_seconds: float = 0.1,
+        retention_seconds: float = 3600,
+        purge_interval_seconds: float = 60,
+        latency_window: int = 1000,
+        local_buffer_size: int = 1000
+    ):
+        self.redis = redis
+        self.breaker = breaker
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retention_seconds = retention_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._publish_with_seq = redis.register_script(PUBLISH_WITH_SEQ_SCRIPT)
+        self._wake = asyncio.Event()
+        self._last_purge = 0.0
+        self._relayed = 0
+        self._batches = 0
+        self._failures = 0
+        self._enqueue_batches: deque[int] = deque(maxlen=latency_window)
+        self._publish_batches: deque[int] = deque(maxlen=latency_window)
+        self._publish_latencies_ms: deque[float] = deque(maxlen=latency_window)
+        self._pipeline_latencies_ms: deque[float] = deque(maxlen=latency_window)
+        self._local_events: deque[tuple[int, str]] = deque(maxlen=local_buffer_size)
+        self._local_sink: Optional[Callable[[int, str], None]] = None
+        self._local_delivered = 0
+        self._local_dropped = 0
+    def wake(self) -> None:
+        self._wake.set()
+    def record_enqueued(self, count: int) -> None:
+        self._enqueue_batches.append(count)
+    def set_local_sink(self, sink: Callable[[int, str], None]) -> None:
+        self._local_sink = sink
+    def buffer_local(self, events: list[tuple[int, str]]) -> None:
+        if not self.breaker.is_open:
+            return
+        self._local_dropped += max(len(self._local_events) + len(events) - self._local_events.maxlen, 0)
+        self._local_events.extend(events)
+        self.wake()
+    def deliver_local(self) -> int:
+        delivered = 0
+        while self._local_events:
+            board_id, payload = self._local_events.popleft()
+            if self._local_sink is not None:
+                self._local_sink(board_id, payload)
+                delivered += 1
+        self._local_delivered += delivered
+        return delivered
+    def _percentile(self, samples: deque, fraction: float) -> float:
+        if not samples:
+            return 0
+        ordered = sorted(samples)
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+    def stats(self) -> dict[str, Any]:
+        return {
+            "relayed": self._relayed,
+            "batches": self._batches,
+            "failures": self._failures,
+            "request_batch_size_avg": round(sum(self._enqueue_batches) / len(self._enqueue_batches), 3) if self._enqueue_batches else 0,
+            "publish_batch_size_avg": round(sum(self._publish_batches) / len(self._publish_batches), 3) if self._publish_batches else 0,
+            "publish_latency_ms_p50": self._percentile(self._publish_latencies_ms, 0.5),
+            "publish_latency_ms_p95": self._percentile(self._publish_latencies_ms, 0.95),
+            "pipeline_ms_p50": self._percentile(self._pipeline_latencies_ms, 0.5),
+            "pipeline_ms_p95": self._percentile(self._pipeline_latencies_ms, 0.95),
+            "local_buffered": len(self._local_events),
+            "local_delivered": self._local_delivered,
+            "local_dropped": self._local_dropped
+        }
+    async def relay_batch(self) -> int:
+        if self.breaker.is_open:
+            self.deliver_local()
+            return 0
+        self._local_events.clear()
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                if not (await session.execute(select(func.pg_try_advisory_xact_lock(OUTBOX_RELAY_LOCK_KEY)))).scalar_one():
+                    return 0
+                events = (await session.execute(
+                    select(OutboxEvent.id, OutboxEvent.board_id, OutboxEvent.payload, OutboxEvent.created_at)
+                    .where(OutboxEvent.delivered_at.is_(None))
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not events:
+                    return 0
+                started = time.perf_counter()
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for event in events:
+                        await self._publish_with_seq(
+                            keys=[board_sequence_key(event.board_id)],
+                            args=[board_channel(event.board_id), event.payload],
+                            client=pipe
+                        )
+                    await self.breaker.call(pipe.execute)
+                pipeline_ms = (time.perf_counter() - started) * 1000
+                published_at = datetime.utcnow()
+                await session.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_([event.id for event in events]))
+                    .values(delivered_at=published_at)
+                )
+        self._relayed += len(events)
+        self._batches += 1
+        self._publish_batches.append(len(events))
+        self._pipeline_latencies_ms.append(pipeline_ms)
+        for event in events:
+            self._publish_latencies_ms.append((published_at - event.created_at).total_seconds() * 1000)
+        return len(events)
+    async def purge_delivered(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(OutboxEvent).where(OutboxEvent.delivered_at < cutoff)
+                )
+        return result.rowcount
+    async def run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                self._failures += 1
+                logger.error(f"Outbox relay failed: {e}")
+                relayed = 0
+            if relayed >= self.batch_size:
+                continue
+            if not relayed and time.monotonic() - self._last_purge >= self.purge_interval_seconds:
+                self._last_purge = time.monotonic()
+                try:
+                    purged = await self.purge_delivered()
+                    if purged:
+                        logger.info(f"Purged {purged} delivered outbox events")
+                except Exception as e:
+                    logger.error(f"Outbox purge failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+outbox_relay = OutboxRelay(
+    redis_client,
+    redis_breaker,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval_seconds=settings.OUTBOX_POLL_INTERVAL_MS / 1000,
+    retention_seconds=settings.OUTBOX_RETENTION_MINUTES * 60,
+    local_buffer_size=settings.OUTBOX_LOCAL_BUFFER_SIZE
+)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import threading
+from sqlalchemy import bindparam, insert, select, update
+from database import AsyncSessionLocal
+from models import Board, BoardChange, Card, List
+from utils.ranking import spaced_ranks
+logger = logging.getLogger(__name__)
+class RankRebalancer:
+    def __init__(self, interval_seconds: float = 1.0):
+        self.interval_seconds = interval_seconds
+        self._pending: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+    def schedule(self, list_id: int) -> None:
+        with self._lock:
+            self._pending.add(("cards", list_id))
+    def schedule_board(self, board_id: int) -> None:
+        with self._lock:
+            self._pending.add(("lists", board_id))
+    def _drain(self) -> set[tuple[str, int]]:
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        return pending
+    async def _rebalance(self, model, scope_column, scope_id: int, values: dict, entity_type: str, board_id_query) -> int:
+        table = model.__table__
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(model.id)
+                    .where(scope_column == scope_id)
+                    .order_by(model.position, model.id)
+                    .with_for_update()
+                )
+                row_ids = result.scalars().all()
+                if row_ids:
+                    await session.execute(
+                        table.update()
+                        .where(table.c.id == bindparam("row_id"))
+                        .values(position=bindparam("rank"), **values),
+                        [
+                            {"row_id": row_id, "rank": rank}
+                            for row_id, rank in zip(row_ids, spaced_ranks(len(row_ids)))
+                        ]
+                    )
+                    board_id, version = (await session.execute(
+                        update(Board)
+                        .where(Board.id == board_id_query)
+                        .values(version=Board.version + 1)
+                        .returning(Board.id, Board.version)
+                    )).one()
+                    await session.execute(insert(BoardChange), [
+                        {
+                            "board_id": board_id,
+                            "version": version,
+                            "entity_type": entity_type,
+                            "entity_id": row_id,
+                            "operation": "upsert"
+                        }
+                        for row_id in row_ids
+                    ])
+        return len(row_ids)
+    async def rebalance_list(self, list_id: int) -> int:
+        board_id_query = select(List.board_id).where(List.id == list_id).scalar_subquery()
+        return await self._rebalance(Card, Card.list_id, list_id, {}, "card", board_id_query)
+    async def rebalance_board(self, board_id: int) -> int:
+        return await self._rebalance(List, List.board_id, board_id, {"version": List.__table__.c.version + 1}, "list", board_id)
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            for scope, scope_id in self._drain():
+                try:
+                    if scope == "lists":
+                        count = await self.rebalance_board(scope_id)
+                        logger.info(f"Rebalanced {count} list ranks in board {scope_id}")
+                    else:
+                        count = await self.rebalance_list(scope_id)
+                        logger.info(f"Rebalanced {count} card ranks in list {scope_id}")
+                except Exception as e:
+                    logger.error(f"Error rebalancing {scope} in {scope_id}: {e}")
+                    with self._lock:
+                        self._pending.add((scope, scope_id))
+rank_rebalancer = RankRebalancer()
\ No newline at end of file
@@ -0,0 +1,23 @@
+import asyncio
+import logging
+from config import settings
+from database import AsyncSessionLocal
+from repositories.refresh_session_repository import RefreshSessionRepository
+logger = logging.getLogger(__name__)
+class RefreshSessionCleanup:
+    def __init__(self, interval_seconds: float = 3600):
+        self.interval_seconds = interval_seconds
+    async def purge(self) -> int:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                return await RefreshSessionRepository(session).delete_expired()
+    async def run(self) -> None:
+        while True:
+            try:
+                purged = await self.purge()
+                if purged:
+                    logger.info(f"Purged {purged} expired refresh sessions")
+            except Exception as e:
+                logger.error(f"Refresh session purge failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+refresh_session_cleanup = RefreshSessionCleanup(interval_seconds=settings.REFRESH_SESSION_PURGE_INTERVAL_SECONDS)
\ No newline at end of file
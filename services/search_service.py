@@ -0,0 +1,46 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, func, literal_column, select, tuple_
+from models import Board, Card, List
+from repositories.board_repository import BoardRepository
+from utils.pagination import encode_cursor, decode_cursor
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+class SearchService:
+    @staticmethod
+    def card_search_query(user_id: int, text: str):
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+        rank = func.ts_rank_cd(Card.search_vector, tsquery, type_=Float)
+        query = (
+            select(
+                Card.id,
+                Card.title,
+                Card.description,
+                Card.list_id,
+                List.board_id,
+                rank.label("rank")
+            )
+            .join(List, Card.list_id == List.id)
+            .join(Board, List.board_id == Board.id)
+            .where(Card.search_vector.op("@@")(tsquery))
+            .where(BoardRepository.readable_by(user_id))
+        )
+        return query, rank
+    @staticmethod
+    async def search_cards(
+        db: AsyncSession,
+        user_id: int,
+        text: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[list, Optional[str]]:
+        query, rank = SearchService.card_search_query(user_id, text)
+        if cursor is not None:
+            last_rank, last_id = decode_cursor(cursor, rank)
+            query = query.where(tuple_(rank, Card.id) < tuple_(last_rank, last_id))
+        rows = (await db.execute(
+            query.order_by(rank.desc(), Card.id.desc()).limit(limit + 1)
+        )).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].rank, rows[-1].id)
\ No newline at end of file
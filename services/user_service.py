@@ -0,0 +1,35 @@
+from typing import Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_unit_of_work
+from models import User
+from repositories.user_repository import UserRepository
+from auth.principal_cache import principal_cache
+class UserService:
+    @staticmethod
+    async def update_user(db: AsyncSession, user_id: int, update_data: dict[str, Any]) -> Optional[User]:
+        user = await UserRepository(db).update(user_id, update_data)
+        if user:
+            await get_unit_of_work(db).commit()
+            await principal_cache.invalidate(user_id)
+        return user
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
+        deleted = await UserRepository(db).delete(user_id)
+        if deleted:
+            await get_unit_of_work(db).commit()
+            await principal_cache.invalidate(user_id)
+        return deleted
+    @staticmethod
+    async def deactivate(db: AsyncSession, user_id: int) -> Optional[User]:
+        user = await UserRepository(db).deactivate(user_id)
+        if user:
+            await get_unit_of_work(db).commit()
+            await principal_cache.invalidate(user_id)
+        return user
+    @staticmethod
+    async def change_password(db: AsyncSession, user_id: int, hashed_password: str) -> Optional[User]:
+        user = await UserRepository(db).update_password(user_id, hashed_password)
+        if user:
+            await get_unit_of_work(db).commit()
+            await principal_cache.invalidate(user_id)
+        return user
\ No newline at end of file
@@ -0,0 +1,31 @@
+import asyncio
+from typing import Any
+class LatencyRedis:
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+        self.published: list[tuple[list[str], list[str]]] = []
+    async def _respond(self, value: Any) -> Any:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        return value
+    async def get(self, key: str) -> Any:
+        return await self._respond(None)
+    def register_script(self, script: str):
+        async def run(keys: list[str], args: list[str], client: "LatencyPipeline") -> None:
+            client.queued.append((keys, args))
+        return run
+    def pipeline(self, transaction: bool = True) -> "LatencyPipeline":
+        return LatencyPipeline(self)
+class LatencyPipeline:
+    def __init__(self, redis: LatencyRedis):
+        self.redis = redis
+        self.queued: list[tuple[list[str], list[str]]] = []
+    async def __aenter__(self) -> "LatencyPipeline":
+        return self
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.queued = []
+    async def execute(self) -> list[int]:
+        result = await self.redis._respond(list(range(1, len(self.queued) + 1)))
+        self.redis.published.extend(self.queued)
+        return result
\ No newline at end of file
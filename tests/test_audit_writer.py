@@ -0,0 +1,43 @@
+import json
+import os
+import pytest
+from sqlalchemy.exc import IntegrityError
+from services.audit_writer import AuditWriter
+DEAD_PID = 999999999
+def _spool_line(kind: str, row: dict) -> str:
+    return json.dumps({"kind": kind, "row": {**row, "timestamp": "2024-01-01T00:00:00"}}) + "\n"
+def test_spool_file_is_per_process(tmp_path):
+    writer = AuditWriter(str(tmp_path / "audit.jsonl"))
+    writer.record_board_activity(1, 2, "board_updated", {})
+    assert os.listdir(tmp_path) == [f"audit.{os.getpid()}.jsonl"]
+def test_load_claims_only_spools_of_dead_processes(tmp_path):
+    (tmp_path / f"audit.{DEAD_PID}.jsonl").write_text(_spool_line("card_history", {"card_id": 1, "user_id": 2, "action": "created", "details": {}}))
+    (tmp_path / f"audit.{os.getppid()}.jsonl").write_text(_spool_line("card_history", {"card_id": 3, "user_id": 2, "action": "created", "details": {}}))
+    (tmp_path / f"audit.{os.getpid()}.jsonl").write_text(_spool_line("board_activity", {"board_id": 4, "user_id": 2, "action": "board_updated", "details": {}}))
+    writer = AuditWriter(str(tmp_path / "audit.jsonl"))
+    writer._load_spool()
+    assert [(kind, row.get("card_id", row.get("board_id"))) for kind, row in writer._pending] == [("board_activity", 4), ("card_history", 1)]
+    assert sorted(os.listdir(tmp_path)) == [f"audit.{os.getppid()}.jsonl", f"audit.{os.getpid()}.jsonl"]
+    assert len((tmp_path / f"audit.{os.getpid()}.jsonl").read_text().splitlines()) == 2
+@pytest.mark.asyncio
+async def test_flush_retries_only_rows_that_were_not_written(tmp_path):
+    writer = AuditWriter(str(tmp_path / "audit.jsonl"))
+    for card_id in range(4):
+        writer.record_card_history(card_id, 1, "updated", {})
+    written_ids = []
+    database_down = True
+    async def write(batch):
+        if len(batch) > 1:
+            raise IntegrityError("INSERT", {}, Exception("duplicate key"))
+        card_id = batch[0][1]["card_id"]
+        if card_id == 2 and database_down:
+            raise ConnectionError("database unavailable")
+        written_ids.append(card_id)
+    writer._write = write
+    assert await writer.flush() == 2
+    assert [row["card_id"] for _, row in writer._pending] == [2, 3]
+    assert len((tmp_path / f"audit.{os.getpid()}.jsonl").read_text().splitlines()) == 2
+    database_down = False
+    assert await writer.flush() == 2
+    assert written_ids == [0, 1, 2, 3]
+    assert writer._pending == []
\ No newline at end of file
@@ -0,0 +1,50 @@
+import ast
+from pathlib import Path
+ROOT = Path(__file__).resolve().parent.parent
+SCANNED_PACKAGES = ("api", "auth", "middleware", "repositories", "services", "utils")
+SESSION_NAMES = {"db", "session", "self.db"}
+SESSION_METHODS = {"execute", "commit", "flush", "refresh", "get", "scalar", "scalars", "delete", "rollback", "close", "stream"}
+BLOCKING_CALLS = {"time.sleep", "pwd_context.hash", "pwd_context.verify", "requests.get", "requests.post"}
+def _dotted_name(node: ast.AST) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return f"{base}.{node.attr}" if base else None
+    return None
+def _blocking_calls(source: str) -> list[tuple[int, str]]:
+    found = []
+    for function in ast.walk(ast.parse(source)):
+        if not isinstance(function, ast.AsyncFunctionDef):
+            continue
+        awaited = {id(node.value) for node in ast.walk(function) if isinstance(node, ast.Await)}
+        for call in ast.walk(function):
+            if not isinstance(call, ast.Call):
+                continue
+            callee = _dotted_name(call.func)
+            if callee is None:
+                continue
+            receiver, _, method = callee.rpartition(".")
+            if callee in BLOCKING_CALLS:
+                found.append((call.lineno, callee))
+            elif receiver in SESSION_NAMES and method == "query":
+                found.append((call.lineno, callee))
+            elif receiver in SESSION_NAMES and method in SESSION_METHODS and id(call) not in awaited:
+                found.append((call.lineno, callee))
+    return sorted(found)
+def test_detects_blocking_calls():
+    source = (
+        "async def endpoint(db):\n"
+        "    db.query(User).all()\n"
+        "    db.commit()\n"
+        "    time.sleep(1)\n"
+        "    await db.execute(query)\n"
+    )
+    assert _blocking_calls(source) == [(2, "db.query"), (3, "db.commit"), (4, "time.sleep")]
+def test_async_code_paths_do_not_block_the_event_loop():
+    offenders = []
+    for package in SCANNED_PACKAGES:
+        for path in sorted((ROOT / package).rglob("*.py")):
+            for lineno, callee in _blocking_calls(path.read_text()):
+                offenders.append(f"{path.relative_to(ROOT)}:{lineno} {callee}")
+    assert offenders == []
\ No newline at end of file
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from tests.redis_stub import LatencyRedis
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker("redis", failure_threshold=3, recovery_timeout_seconds=0.05, call_timeout_seconds=0.01)
+async def _trip(breaker: CircuitBreaker, redis: LatencyRedis) -> None:
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(redis.get, "key")
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_timeouts():
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    await _trip(breaker, redis)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(redis.get, "key")
+    assert redis.calls == breaker.failure_threshold
+    assert breaker.stats()["rejected"] == 1
+@pytest.mark.asyncio
+async def test_success_resets_failure_count():
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    for _ in range(breaker.failure_threshold - 1):
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(redis.get, "key")
+    redis.latency_seconds = 0
+    await breaker.call(redis.get, "key")
+    assert breaker.stats()["consecutive_failures"] == 0
+    assert breaker.state == CLOSED
+@pytest.mark.asyncio
+async def test_half_open_allows_a_single_probe():
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    await _trip(breaker, redis)
+    await asyncio.sleep(breaker.recovery_timeout_seconds)
+    assert breaker.state == HALF_OPEN
+    redis.latency_seconds = 0.005
+    probe = asyncio.create_task(breaker.call(redis.get, "key"))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(redis.get, "key")
+    await probe
+    assert breaker.state == CLOSED
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_the_circuit():
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    await _trip(breaker, redis)
+    await asyncio.sleep(breaker.recovery_timeout_seconds)
+    with pytest.raises(asyncio.TimeoutError):
+        await breaker.call(redis.get, "key")
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 2
+@pytest.mark.asyncio
+async def test_recovers_once_latency_drops():
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    await _trip(breaker, redis)
+    redis.latency_seconds = 0
+    await asyncio.sleep(breaker.recovery_timeout_seconds)
+    await breaker.call(redis.get, "key")
+    await breaker.call(redis.get, "key")
+    assert breaker.state == CLOSED
+    assert breaker.stats()["succeeded"] == 2
\ No newline at end of file
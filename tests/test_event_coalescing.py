@@ -0,0 +1,31 @@
+from utils.event_coalescing import coalesce_events
+def _event(seq: int, event_type: str, resource_id: int, changes: dict | None = None) -> dict:
+    data = {"type": event_type, "resource_type": "card", "resource_id": resource_id, "additional_data": {}}
+    if changes is not None:
+        data["additional_data"]["changes"] = changes
+    return {"seq": seq, "type": "notification", "data": data}
+def test_collapsed_event_keeps_seq_order_with_interleaved_events():
+    events = [
+        _event(1, "card_updated", 7, {"title": {"old": "a", "new": "b"}}),
+        _event(2, "card_created", 8),
+        _event(3, "card_updated", 7, {"title": {"old": "b", "new": "c"}}),
+        _event(4, "comment_added", 8),
+        _event(5, "card_updated", 7, {"description": {"old": None, "new": "d"}})
+    ]
+    coalesced = coalesce_events(events)
+    assert [event["seq"] for event in coalesced] == [2, 4, 5]
+    assert coalesced[-1]["data"]["additional_data"]["changes"] == {
+        "title": {"old": "a", "new": "c"},
+        "description": {"old": None, "new": "d"}
+    }
+def test_distinct_resources_are_not_collapsed():
+    events = [
+        _event(1, "card_moved", 7),
+        _event(2, "card_moved", 8),
+        _event(3, "card_updated", 7),
+        _event(4, "card_moved", 7)
+    ]
+    assert [event["seq"] for event in coalesce_events(events)] == [2, 3, 4]
+def test_non_collapsible_events_pass_through():
+    events = [_event(1, "card_created", 7), _event(2, "card_created", 7)]
+    assert coalesce_events(events) == events
\ No newline at end of file
@@ -0,0 +1,18 @@
+import importlib
+import pytest
+@pytest.mark.parametrize("module, attribute", [
+    ("main", "app"),
+    ("services.board_service", "BoardService"),
+    ("services.card_service", "CardService"),
+    ("services.search_service", "SearchService"),
+    ("services.notification_service", "NotificationService"),
+    ("services.board_import", "import_board")
+])
+def test_module_imports(module, attribute):
+    assert hasattr(importlib.import_module(module), attribute)
+def test_app_routes_registered():
+    from main import app
+    paths = {route.path for route in app.routes}
+    assert "/api/v1/cards/{card_id}" in paths
+    assert "/api/v1/boards/{board_id}/members" in paths
+    assert "/api/v1/ws/boards/{board_id}" in paths
\ No newline at end of file
@@ -0,0 +1,7 @@
+import pytest
+from pydantic import ValidationError
+from schemas import ListReorder
+def test_list_reorder_requires_version():
+    with pytest.raises(ValidationError):
+        ListReorder(new_position=1)
+    assert ListReorder(new_position=1, version=3).version == 3
\ No newline at end of file
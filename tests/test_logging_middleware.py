@@ -0,0 +1,66 @@
+import time
+import uuid
+import pytest
+from middleware.logging import MAX_CORRELATION_ID_LENGTH, LoggingMiddleware
+MAX_OVERHEAD_SECONDS = 50e-6
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+def _scope(headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/health",
+        "query_string": b"",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 1234)
+    }
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+async def _request(app, scope: dict) -> list[dict]:
+    messages = []
+    async def send(message):
+        messages.append(message)
+    await app(scope, _receive, send)
+    return messages
+def _response_header(messages: list[dict], name: bytes) -> bytes | None:
+    return dict(messages[0]["headers"]).get(name)
+def _middleware() -> LoggingMiddleware:
+    return LoggingMiddleware(_ok_app, success_sample_rate=0.0, slow_request_ms=60000)
+@pytest.mark.asyncio
+async def test_correlation_id_is_passed_through():
+    scope = _scope([(b"x-correlation-id", b"req-123")])
+    messages = await _request(_middleware(), scope)
+    assert _response_header(messages, b"x-correlation-id") == b"req-123"
+    assert scope["state"]["correlation_id"] == "req-123"
+@pytest.mark.asyncio
+async def test_correlation_id_is_truncated():
+    scope = _scope([(b"x-correlation-id", b"a" * (MAX_CORRELATION_ID_LENGTH + 72))])
+    messages = await _request(_middleware(), scope)
+    assert _response_header(messages, b"x-correlation-id") == b"a" * MAX_CORRELATION_ID_LENGTH
+    assert len(scope["state"]["correlation_id"]) == MAX_CORRELATION_ID_LENGTH
+@pytest.mark.asyncio
+async def test_correlation_id_is_generated_when_missing():
+    messages = await _request(_middleware(), _scope())
+    assert uuid.UUID(_response_header(messages, b"x-correlation-id").decode())
+    assert _response_header(messages, b"x-process-time") is not None
+@pytest.mark.asyncio
+async def test_non_http_scopes_bypass_the_middleware():
+    scopes = []
+    async def app(scope, receive, send):
+        scopes.append(scope)
+    await LoggingMiddleware(app)({"type": "lifespan"}, _receive, None)
+    assert scopes == [{"type": "lifespan"}]
+async def _time_requests(app, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        await _request(app, _scope([(b"x-correlation-id", b"req-123")]))
+    return time.perf_counter() - started
+@pytest.mark.asyncio
+async def test_per_request_overhead_is_small():
+    count = 5000
+    middleware = _middleware()
+    await _time_requests(middleware, 100)
+    bare = min([await _time_requests(_ok_app, count) for _ in range(3)])
+    wrapped = min([await _time_requests(middleware, count) for _ in range(3)])
+    assert (wrapped - bare) / count < MAX_OVERHEAD_SECONDS
\ No newline at end of file
@@ -0,0 +1,8 @@
+from sqlalchemy.orm import configure_mappers
+from models import Card, User, card_assignees
+def test_mappers_configure():
+    configure_mappers()
+def test_card_assignees_relationship():
+    relationship = Card.__mapper__.relationships["assignees"]
+    assert relationship.secondary is card_assignees
+    assert relationship.mapper.class_ is User
\ No newline at end of file
@@ -0,0 +1,18 @@
+import json
+from types import SimpleNamespace
+import pytest
+from schemas import NotificationType
+from services.notification_service import NotificationService
+@pytest.mark.asyncio
+async def test_publish_encodes_each_event_once_with_orjson():
+    service = NotificationService(SimpleNamespace(info={}))
+    notification = service._create_notification(
+        NotificationType.CARD_CREATED, "Card created", "a created b", 11, "card", 2, 3, {"list_id": 5}
+    )
+    await service._publish(3, notification)
+    payloads = [row["payload"] for row in service._pending]
+    assert payloads[0].startswith('{"type":"notification","data":{')
+    event = json.loads(payloads[0])
+    assert event["data"]["type"] == "card_created"
+    assert event["data"]["additional_data"] == {"list_id": 5}
+    assert event["data"]["timestamp"] == notification.timestamp.isoformat()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from services import outbox_relay as relay_module
+from services.outbox_relay import OutboxRelay
+from utils.circuit_breaker import OPEN, CircuitBreaker
+from tests.redis_stub import LatencyRedis
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+    def scalar_one(self):
+        return self.value
+    def all(self):
+        return self.value
+class FakeTransaction:
+    def __init__(self, session: "FakeSession"):
+        self.session = session
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.session.outcome = "rollback" if exc_type else "commit"
+class FakeSession:
+    def __init__(self, events: list, lock_acquired: bool = True):
+        self.results = [FakeResult(lock_acquired), FakeResult(events)]
+        self.statements = []
+        self.outcome = None
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *exc_info):
+        return None
+    def begin(self) -> FakeTransaction:
+        return FakeTransaction(self)
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0) if self.results else FakeResult(None)
+def _events(count: int) -> list:
+    return [
+        SimpleNamespace(id=index, board_id=1, payload='{"type":"notification"}', created_at=datetime.utcnow())
+        for index in range(1, count + 1)
+    ]
+def _relay(redis: LatencyRedis, breaker: CircuitBreaker) -> OutboxRelay:
+    return OutboxRelay(redis, breaker, batch_size=10, poll_interval_seconds=0.01)
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker("redis", failure_threshold=2, recovery_timeout_seconds=0.05, call_timeout_seconds=0.01)
+@pytest.mark.asyncio
+async def test_relay_skips_the_database_while_the_breaker_is_open(monkeypatch):
+    breaker = _breaker()
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", lambda: pytest.fail("relay opened a session while the breaker was open"))
+    assert await _relay(LatencyRedis(), breaker).relay_batch() == 0
+@pytest.mark.asyncio
+async def test_slow_redis_trips_the_breaker_and_leaves_events_undelivered(monkeypatch):
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    relay = _relay(redis, breaker)
+    sessions = []
+    def session_factory():
+        sessions.append(FakeSession(_events(3)))
+        return sessions[-1]
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", session_factory)
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(asyncio.TimeoutError):
+            await relay.relay_batch()
+    assert breaker.state == OPEN
+    assert [session.outcome for session in sessions] == ["rollback", "rollback"]
+    assert all(len(session.statements) == 2 for session in sessions)
+    assert await relay.relay_batch() == 0
+    assert len(sessions) == 2
+    assert redis.published == []
+@pytest.mark.asyncio
+async def test_relay_resumes_after_recovery(monkeypatch):
+    breaker = _breaker()
+    redis = LatencyRedis(latency_seconds=0.05)
+    relay = _relay(redis, breaker)
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", lambda: FakeSession(_events(3)))
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(asyncio.TimeoutError):
+            await relay.relay_batch()
+    redis.latency_seconds = 0
+    await asyncio.sleep(breaker.recovery_timeout_seconds)
+    assert await relay.relay_batch() == 3
+    assert [args[1] for _, args in redis.published] == ['{"type":"notification"}'] * 3
+    assert relay.stats()["relayed"] == 3
+@pytest.mark.asyncio
+async def test_relay_yields_when_another_worker_holds_the_lock(monkeypatch):
+    session = FakeSession(_events(3), lock_acquired=False)
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", lambda: session)
+    assert await _relay(LatencyRedis(), _breaker()).relay_batch() == 0
+    assert len(session.statements) == 1
+@pytest.mark.asyncio
+async def test_open_breaker_feeds_local_sink_then_outbox_replays_on_recovery(monkeypatch):
+    breaker = _breaker()
+    redis = LatencyRedis()
+    relay = OutboxRelay(redis, breaker, batch_size=10, poll_interval_seconds=0.01, local_buffer_size=2)
+    delivered = []
+    relay.set_local_sink(lambda board_id, payload: delivered.append((board_id, payload)))
+    relay.buffer_local([(1, "ignored while closed")])
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    relay.buffer_local([(1, "a"), (1, "b"), (2, "c")])
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", lambda: pytest.fail("relay opened a session while the breaker was open"))
+    assert await relay.relay_batch() == 0
+    assert delivered == [(1, "b"), (2, "c")]
+    assert relay.stats()["local_dropped"] == 1
+    assert relay.stats()["local_delivered"] == 2
+    relay.buffer_local([(1, "d")])
+    await asyncio.sleep(breaker.recovery_timeout_seconds)
+    monkeypatch.setattr(relay_module, "AsyncSessionLocal", lambda: FakeSession(_events(3)))
+    assert await relay.relay_batch() == 3
+    assert relay.stats()["local_buffered"] == 0
+    assert delivered == [(1, "b"), (2, "c")]
+    assert len(redis.published) == 3
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+import pytest
+from auth.password_hasher import PasswordHasher, pwd_context
+from utils.exceptions import ServiceUnavailableError
+MAX_LOOP_LAG_SECONDS = 0.05
+async def _measure_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, loop.time() - started - interval)
+    return max_lag
+@pytest.mark.asyncio
+async def test_concurrent_hashing_keeps_event_loop_responsive():
+    hasher = PasswordHasher(max_workers=4, max_pending=64)
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(stop))
+    try:
+        hashes = await asyncio.gather(*(hasher.hash(f"password-{i}") for i in range(8)))
+    finally:
+        stop.set()
+        hasher.shutdown()
+    assert await lag_task < MAX_LOOP_LAG_SECONDS
+    assert all(pwd_context.verify(f"password-{i}", hashed) for i, hashed in enumerate(hashes))
+@pytest.mark.asyncio
+async def test_inline_hashing_blocks_event_loop():
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    pwd_context.hash("password")
+    blocked = time.perf_counter() - started
+    await asyncio.sleep(0.01)
+    stop.set()
+    assert await lag_task >= min(blocked, MAX_LOOP_LAG_SECONDS)
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_with_503():
+    hasher = PasswordHasher(max_workers=2, max_pending=2, retry_after_seconds=3)
+    release = threading.Event()
+    blocked = [asyncio.create_task(hasher._run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    try:
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await hasher.hash("password")
+    finally:
+        release.set()
+        await asyncio.gather(*blocked)
+        hasher.shutdown()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "3"}
+    assert hasher.stats() == {"pending": 0, "rejected": 1, "completed": 2}
\ No newline at end of file
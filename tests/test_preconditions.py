@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+import pytest
+from repositories.board_repository import BoardRepository
+from services.board_service import BoardService
+from utils.exceptions import PreconditionFailedError
+@pytest.fixture
+def stamp_calls(monkeypatch):
+    calls = []
+    async def get_version_stamp(self, board_id, for_update=False):
+        calls.append((board_id, for_update))
+        return SimpleNamespace(id=board_id, version=7, members_version=2)
+    monkeypatch.setattr(BoardRepository, "get_version_stamp", get_version_stamp)
+    return calls
+@pytest.mark.asyncio
+async def test_matching_strong_etag_passes_under_the_row_lock(stamp_calls):
+    await BoardService.check_precondition(None, 5, '"lists-5-7-2"', "lists")
+    await BoardService.check_precondition(None, 5, '"other", "labels-5-7-2"', "labels")
+    assert stamp_calls == [(5, True), (5, True)]
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_match", ['W/"lists-5-7-2"', '"lists-5-6-2"', '"labels-5-7-2"'])
+async def test_weak_or_stale_etag_is_rejected(stamp_calls, if_match):
+    with pytest.raises(PreconditionFailedError):
+        await BoardService.check_precondition(None, 5, if_match, "lists")
+@pytest.mark.asyncio
+async def test_missing_if_match_skips_the_lock(stamp_calls):
+    await BoardService.check_precondition(None, 5, None, "lists")
+    assert stamp_calls == []
\ No newline at end of file
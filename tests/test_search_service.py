@@ -0,0 +1,32 @@
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from models import Card
+from services.search_service import SearchService
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+def test_card_search_query_filters_on_readable_boards():
+    query, rank = SearchService.card_search_query(42, "roadmap review")
+    sql = _compile(query.order_by(rank.desc(), Card.id.desc()).limit(21))
+    assert "cards.search_vector @@ websearch_to_tsquery('simple'::regconfig, 'roadmap review')" in sql
+    assert "JOIN boards ON lists.board_id = boards.id" in sql
+    assert "boards.is_public IS true" in sql
+    assert "boards.owner_id = 42" in sql
+    assert "SELECT board_members.board_id" in sql
+    assert "board_members.user_id = 42" in sql
+@pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL points at a migrated database")
+@pytest.mark.asyncio
+async def test_card_search_uses_the_gin_index():
+    query, rank = SearchService.card_search_query(1, "roadmap review")
+    compiled = _compile(query.order_by(rank.desc(), Card.id.desc()).limit(21))
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SET enable_seqscan = off"))
+            plan = "\n".join(row[0] for row in await connection.execute(text(f"EXPLAIN {compiled}")))
+    finally:
+        await engine.dispose()
+    assert "idx_cards_search_vector" in plan
\ No newline at end of file
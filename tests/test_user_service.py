@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+import pytest
+from database import get_unit_of_work
+from repositories.user_repository import UserRepository
+from services import user_service as user_service_module
+from services.user_service import UserService
+class FakeSession:
+    def __init__(self, row):
+        self.row = row
+        self.info = {}
+        self.events = []
+    async def execute(self, statement):
+        self.events.append("execute")
+        return SimpleNamespace(scalar_one_or_none=lambda: self.row)
+    async def commit(self):
+        self.events.append("commit")
+@pytest.mark.asyncio
+async def test_repository_writes_leave_the_commit_to_the_caller():
+    session = FakeSession(SimpleNamespace(id=3))
+    repository = UserRepository(session)
+    await repository.update(3, {"full_name": "Ada"})
+    await repository.deactivate(3)
+    await repository.update_password(3, "hash")
+    await repository.delete(3)
+    assert session.events == ["execute"] * 4
+@pytest.mark.asyncio
+async def test_user_service_commits_once_through_the_unit_of_work(monkeypatch):
+    session = FakeSession(SimpleNamespace(id=3))
+    invalidated = []
+    async def invalidate(user_id):
+        invalidated.append((user_id, list(session.events)))
+    monkeypatch.setattr(user_service_module.principal_cache, "invalidate", invalidate)
+    get_unit_of_work(session).before_commit(lambda: session.events.append("before_commit"))
+    await UserService.deactivate(session, 3)
+    assert session.events == ["execute", "before_commit", "commit"]
+    assert invalidated == [(3, ["execute", "before_commit", "commit"])]
\ No newline at end of file
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+T = TypeVar("T")
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+class CircuitOpenError(Exception):
+    pass
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout_seconds: float = 5.0,
+        call_timeout_seconds: float = 0.25
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_seconds = recovery_timeout_seconds
+        self.call_timeout_seconds = call_timeout_seconds
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self._failed = 0
+        self._succeeded = 0
+        self._opened = 0
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout_seconds:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            return self._state
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+    def allow(self) -> bool:
+        state = self.state
+        with self._lock:
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+    def record_success(self) -> None:
+        with self._lock:
+            self._succeeded += 1
+            self._failures = 0
+            self._probe_in_flight = False
+            self._state = CLOSED
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failed += 1
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._opened += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout=self.call_timeout_seconds)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._probe_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+    def stats(self) -> dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened": self._opened,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "succeeded": self._succeeded
+            }
\ No newline at end of file
@@ -0,0 +1,23 @@
+from typing import Any, Optional
+from fastapi import Response, status
+def board_etag(stamp: Any, resource: str) -> str:
+    return f'"{resource}-{stamp.id}-{stamp.version}-{stamp.members_version}"'
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
\ No newline at end of file
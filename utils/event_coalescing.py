@@ -0,0 +1,29 @@
+from typing import Any, Optional
+COLLAPSIBLE_EVENT_TYPES = {"card_updated", "card_moved", "board_updated"}
+def _merge_changes(previous: dict[str, Any], event: dict[str, Any]) -> None:
+    data = event.get("data") or {}
+    previous_changes = (previous.get("data") or {}).get("additional_data", {}).get("changes")
+    changes = data.get("additional_data", {}).get("changes")
+    if isinstance(previous_changes, dict) and isinstance(changes, dict):
+        merged = {**previous_changes}
+        for field, change in changes.items():
+            if field in merged and isinstance(merged[field], dict) and isinstance(change, dict):
+                merged[field] = {**change, "old": merged[field].get("old", change.get("old"))}
+            else:
+                merged[field] = change
+        data["additional_data"]["changes"] = merged
+def coalesce_events(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    slots: list[Optional[dict[str, Any]]] = []
+    positions: dict[tuple, int] = {}
+    for event in events:
+        data = event.get("data") or {}
+        if data.get("type") not in COLLAPSIBLE_EVENT_TYPES:
+            slots.append(event)
+            continue
+        key = (data.get("type"), data.get("resource_type"), data.get("resource_id"))
+        if key in positions:
+            _merge_changes(slots[positions[key]], event)
+            slots[positions[key]] = None
+        positions[key] = len(slots)
+        slots.append(event)
+    return [event for event in slots if event is not None]
\ No newline at end of file
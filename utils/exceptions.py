@@ -4,4 +4,37 @@ class PermissionError(HTTPException):
         super().__init__(status_code=403, detail=detail)
 class NotFoundError(HTTPException):
     def __init__(self, detail: str = "Resource not found"):
-        super().__init__(status_code=404, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=404, detail=detail)
+class UserAlreadyExistsError(HTTPException):
+    def __init__(self, detail: str = "User already exists"):
+        super().__init__(status_code=409, detail=detail)
+class InvalidCredentialsError(HTTPException):
+    def __init__(self, detail: str = "Invalid credentials"):
+        super().__init__(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+class ServiceUnavailableError(HTTPException):
+    def __init__(self, detail: str = "Service unavailable", retry_after: int = 1):
+        super().__init__(status_code=503, detail=detail, headers={"Retry-After": str(retry_after)})
+class InvalidCursorError(HTTPException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=400, detail=detail)
+class ImportValidationError(HTTPException):
+    def __init__(self, errors: list[str]):
+        super().__init__(status_code=422, detail=errors)
+class PreconditionFailedError(HTTPException):
+    def __init__(self, detail: str = "Resource has been modified"):
+        super().__init__(status_code=412, detail=detail)
+class ChangesExpiredError(HTTPException):
+    def __init__(self, detail: str = "Changes are no longer available, a full resync is required"):
+        super().__init__(status_code=410, detail=detail)
+class BadRequestException(HTTPException):
+    def __init__(self, detail: str = "Bad request"):
+        super().__init__(status_code=400, detail=detail)
+class ValidationError(HTTPException):
+    def __init__(self, detail: str = "Validation error"):
+        super().__init__(status_code=422, detail=detail)
+class NotFoundException(NotFoundError):
+    pass
+class PermissionException(PermissionError):
+    pass
+class DuplicateResourceException(UserAlreadyExistsError):
+    pass
\ No newline at end of file
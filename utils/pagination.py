@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+from sqlalchemy import DateTime
+from sqlalchemy.orm import InstrumentedAttribute
+from utils.exceptions import InvalidCursorError
+def encode_cursor(sort_value: Any, id: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+def decode_cursor(cursor: str, sort_column: InstrumentedAttribute) -> tuple[Any, Any]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, id = json.loads(payload)
+        if isinstance(sort_column.type, DateTime) and sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError()
+    return sort_value, id
\ No newline at end of file
@@ -0,0 +1,55 @@
+from typing import Optional
+RANK_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+RANK_BASE = len(RANK_DIGITS)
+RANK_MAX_LENGTH = 24
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    if upper is not None:
+        n = 0
+        while n < len(upper) and (lower[n] if n < len(lower) else "0") == upper[n]:
+            n += 1
+        if n > 0:
+            return upper[:n] + _midpoint(lower[n:], upper[n:])
+    digit_lower = RANK_DIGITS.index(lower[0]) if lower else 0
+    digit_upper = RANK_DIGITS.index(upper[0]) if upper else RANK_BASE
+    if digit_upper - digit_lower > 1:
+        return RANK_DIGITS[(digit_lower + digit_upper + 1) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[:1]
+    return RANK_DIGITS[digit_lower] + _midpoint(lower[1:], None)
+def _increment(lower: str) -> Optional[str]:
+    for index, char in enumerate(lower):
+        digit = RANK_DIGITS.index(char)
+        if digit < RANK_BASE - 1:
+            return lower[:index] + RANK_DIGITS[digit + 1]
+    return None
+def _decrement(upper: str) -> Optional[str]:
+    for index, char in enumerate(upper):
+        digit = RANK_DIGITS.index(char)
+        if digit > 1:
+            return upper[:index] + RANK_DIGITS[digit - 1]
+    return None
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    lower = before or ""
+    if after is not None and lower >= after:
+        raise ValueError(f"Invalid rank interval: {before!r} >= {after!r}")
+    if after is None and lower:
+        return _increment(lower) or _midpoint(lower, None)
+    if not lower and after is not None:
+        return _decrement(after) or _midpoint(lower, after)
+    return _midpoint(lower, after)
+def spaced_ranks(count: int) -> list[str]:
+    width = 1
+    while RANK_BASE ** width < (count + 1) * RANK_BASE:
+        width += 1
+    step = RANK_BASE ** width // (count + 1)
+    ranks = []
+    for index in range(1, count + 1):
+        value = index * step
+        digits = []
+        for _ in range(width):
+            value, remainder = divmod(value, RANK_BASE)
+            digits.append(RANK_DIGITS[remainder])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) >= RANK_MAX_LENGTH
\ No newline at end of file
@@ -0,0 +1,13 @@
+from redis.asyncio import ConnectionPool, Redis
+from config import settings
+from utils.circuit_breaker import CircuitBreaker
+redis_pool = ConnectionPool.from_url(settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS)
+redis_client = Redis(connection_pool=redis_pool)
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout_seconds=settings.REDIS_BREAKER_RECOVERY_SECONDS,
+    call_timeout_seconds=settings.REDIS_CALL_TIMEOUT_MS / 1000
+)
+def get_redis() -> Redis:
+    return redis_client
\ No newline at end of file
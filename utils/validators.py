@@ -1,11 +1,23 @@
 import re
 from datetime import datetime, timezone
 from typing import Optional
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NAME_CHARACTER_PATTERNS = {
+    (True, True): re.compile(r'^[\w\s]+$'),
+    (True, False): re.compile(r'^[^\d\s][\w\s]*[^\d\s]$'),
+    (False, True): re.compile(r'^[\w]+$'),
+    (False, False): re.compile(r'^[^\d][\w]*[^\d]$'),
+}
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]{3,30}$')
+BOARD_NAME_PATTERN = re.compile(r'^[\w\s\-]{1,100}$')
+LIST_NAME_PATTERN = re.compile(r'^[\w\s\-]{1,100}$')
+CARD_NAME_PATTERN = re.compile(r'^[\w\s\-]{1,200}$')
+LABEL_NAME_PATTERN = re.compile(r'^[\w\s\-]{1,50}$')
+COLOR_HEX_PATTERN = re.compile(r'^#[0-9a-fA-F]{6}$')
 def validate_email_format(email: str) -> bool:
     if not email or not isinstance(email, str):
         return False
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(EMAIL_PATTERN.match(email))
 def validate_email_domain(email: str, allowed_domains: Optional[list[str]] = None) -> bool:
     if allowed_domains is None:
         return True
@@ -18,43 +30,29 @@ def validate_name_length(name: str, min_length: int = 1, max_length: int = 100)
 def validate_name_characters(name: str, allow_spaces: bool = True, allow_numbers: bool = True) -> bool:
     if not name or not isinstance(name, str):
         return False
-    if allow_spaces and allow_numbers:
-        pattern = r'^[\w\s]+$'
-    elif allow_spaces and not allow_numbers:
-        pattern = r'^[^\d\s][\w\s]*[^\d\s]$'
-    elif not allow_spaces and allow_numbers:
-        pattern = r'^[\w]+$'
-    else:
-        pattern = r'^[^\d][\w]*[^\d]$'
-    try:
-        return bool(re.match(pattern, name.strip()))
-    except re.error:
-        return False
+    return bool(NAME_CHARACTER_PATTERNS[(bool(allow_spaces), bool(allow_numbers))].match(name.strip()))
+def validate_password(password: str, min_length: int = 8) -> bool:
+    return isinstance(password, str) and len(password) >= min_length
 def validate_username(username: str) -> bool:
     if not username or not isinstance(username, str):
         return False
-    pattern = r'^[a-zA-Z0-9_]{3,30}$'
-    return bool(re.match(pattern, username))
+    return bool(USERNAME_PATTERN.match(username))
 def validate_board_name(name: str) -> bool:
     if not validate_name_length(name, min_length=1, max_length=100):
         return False
-    pattern = r'^[\w\s\-]{1,100}$'
-    return bool(re.match(pattern, name.strip()))
+    return bool(BOARD_NAME_PATTERN.match(name.strip()))
 def validate_list_name(name: str) -> bool:
     if not validate_name_length(name, min_length=1, max_length=100):
         return False
-    pattern = r'^[\w\s\-]{1,100}$'
-    return bool(re.match(pattern, name.strip()))
+    return bool(LIST_NAME_PATTERN.match(name.strip()))
 def validate_card_name(name: str) -> bool:
     if not validate_name_length(name, min_length=1, max_length=200):
         return False
-    pattern = r'^[\w\s\-]{1,200}$'
-    return bool(re.match(pattern, name.strip()))
+    return bool(CARD_NAME_PATTERN.match(name.strip()))
 def validate_label_name(name: str) -> bool:
     if not validate_name_length(name, min_length=1, max_length=50):
         return False
-    pattern = r'^[\w\s\-]{1,50}$'
-    return bool(re.match(pattern, name.strip()))
+    return bool(LABEL_NAME_PATTERN.match(name.strip()))
 def validate_comment_content(content: str) -> bool:
     if not content or not isinstance(content, str):
         return False
@@ -90,5 +88,4 @@ def validate_iso_format(date_string: str) -> bool:
 def validate_color_hex(color: str) -> bool:
     if not color or not isinstance(color, str):
         return False
-    pattern = r'^#[0-9a-fA-F]{6}$'
-    return bool(re.match(pattern, color))
\ No newline at end of file
+    return bool(COLOR_HEX_PATTERN.match(color))
\ No newline at end of file